@@ -13,12 +13,13 @@ from rich.panel import Panel
 from rich.status import Status
 from rich.table import Table
 
-from utils import run_command
+from utils import profile_option, run_command
 
 app = typer.Typer(
     name="dev",
     help="Development Environment Management Script",
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
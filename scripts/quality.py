@@ -12,12 +12,13 @@ from rich.panel import Panel
 from rich.status import Status
 from rich.table import Table
 
-from utils import run_command
+from utils import profile_option, run_command, run_parallel
 
 app = typer.Typer(
     name="quality",
     help="Code Quality Management Script",
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
@@ -26,38 +27,47 @@ PROJECT_ROOT = Path(__file__).parent.parent
 TESTS_PATH = PROJECT_ROOT / "tests"
 SCRIPTS_PATH = PROJECT_ROOT / "scripts"
 
+# Independent checks run by `check`: name -> (table label, command)
+CHECKS = {
+    "typecheck": (
+        "Type Check",
+        ["mypy", "tests/", "scripts/", "--ignore-missing-imports"],
+    ),
+    "lint": ("Linting", ["ruff", "check", "tests/", "scripts/"]),
+    "format": ("Formatting", ["ruff", "format", "--check", "tests/", "scripts/"]),
+}
+
 
 @app.command()
-def check() -> None:
+def check(
+    jobs: int | None = typer.Option(
+        None, "--jobs", "-j", help="Maximum concurrent checks (default: CPU count)"
+    ),
+) -> None:
     """Run all quality checks (typecheck + lint + format check)."""
     panel = Panel.fit("🔍 Running All Code Quality Checks", style="blue")
     console.print(panel)
 
-    results = {}
-
-    # Type checking
-    with Status("Running mypy type checking...", console=console, spinner="dots"):
-        try:
-            run_command(["mypy", "tests/", "scripts/", "--ignore-missing-imports"])
-            results["typecheck"] = "✅ Pass"
-        except typer.Exit:
-            results["typecheck"] = "❌ Fail"
-
-    # Linting
-    with Status("Running ruff linting...", console=console, spinner="dots"):
-        try:
-            run_command(["ruff", "check", "tests/", "scripts/"])
-            results["lint"] = "✅ Pass"
-        except typer.Exit:
-            results["lint"] = "❌ Fail"
-
-    # Format checking
-    with Status("Checking code formatting...", console=console, spinner="dots"):
-        try:
-            run_command(["ruff", "format", "--check", "tests/", "scripts/"])
-            results["format"] = "✅ Pass"
-        except typer.Exit:
-            results["format"] = "❌ Fail"
+    # The checks are independent, so run them side by side
+    with Status("Running quality checks...", console=console, spinner="dots"):
+        outcomes = run_parallel(
+            {name: cmd for name, (_, cmd) in CHECKS.items()}, max_workers=jobs
+        )
+
+    # Show output from any failing tool, one block per check
+    for name, outcome in outcomes.items():
+        if not outcome.success:
+            label, cmd = CHECKS[name]
+            console.print(f"[red]❌ {label} failed: {' '.join(cmd)}[/red]")
+            if outcome.truncated:
+                dropped = outcome.stdout_dropped + outcome.stderr_dropped
+                console.print(
+                    f"[yellow]… {dropped} bytes of earlier output dropped[/yellow]"
+                )
+            if outcome.stdout:
+                console.print(outcome.stdout.rstrip(), markup=False)
+            if outcome.stderr:
+                console.print(outcome.stderr.rstrip(), markup=False)
 
     # Results table
     table = Table(
@@ -66,14 +76,14 @@ def check() -> None:
     table.add_column("Check", style="cyan")
     table.add_column("Result", justify="center")
 
-    table.add_row("Type Check", results["typecheck"])
-    table.add_row("Linting", results["lint"])
-    table.add_row("Formatting", results["format"])
+    for name, outcome in outcomes.items():
+        label, _ = CHECKS[name]
+        table.add_row(label, "✅ Pass" if outcome.success else "❌ Fail")
 
     console.print(table)
 
     # Exit with error if any check failed
-    if "❌ Fail" in results.values():
+    if not all(outcome.success for outcome in outcomes.values()):
         console.print("\n[red]❌ Some quality checks failed[/red]")
         raise typer.Exit(1)
     else:
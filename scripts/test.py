@@ -11,12 +11,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
 
-from utils import run_command
+from utils import profile_option, run_command
 
 app = typer.Typer(
     name="test",
     help="Testing Management Script",
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
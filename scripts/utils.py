@@ -4,34 +4,228 @@ Shared utilities for script commands.
 Provides a unified command runner with subprocess (reliable fallback).
 """
 
+import atexit
+import os
 import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import typer
 from rich.console import Console
+from rich.table import Table
 
 console = Console()
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# How much of each stream bounded capture keeps for failure summaries
+DEFAULT_TAIL_BYTES = 64 * 1024
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_RSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+# Every command run in this process, collected once --profile is enabled
+_PROFILE: list["CommandResult"] | None = None
+
 
 class CommandResult:
     """Result wrapper for command execution."""
 
-    def __init__(self, returncode: int = 0, stdout: str = "", stderr: str = ""):
+    def __init__(
+        self,
+        returncode: int = 0,
+        stdout: str = "",
+        stderr: str = "",
+        stdout_dropped: int = 0,
+        stderr_dropped: int = 0,
+        command: list[str] | None = None,
+        wall_time: float = 0.0,
+        user_time: float = 0.0,
+        system_time: float = 0.0,
+        max_rss: int | None = None,
+        signal: int | None = None,
+    ):
         self.returncode = returncode
         self.stdout = stdout
         self.stderr = stderr
+        self.stdout_dropped = stdout_dropped
+        self.stderr_dropped = stderr_dropped
+        self.command = command or []
+        self.wall_time = wall_time
+        self.user_time = user_time
+        self.system_time = system_time
+        self.max_rss = max_rss
+        self.signal = signal
 
     @property
     def success(self) -> bool:
         """Whether the command was successful."""
         return self.returncode == 0
 
+    @property
+    def truncated(self) -> bool:
+        """Whether bounded capture discarded any output."""
+        return self.stdout_dropped > 0 or self.stderr_dropped > 0
+
+    @property
+    def cpu_time(self) -> float:
+        """User plus system CPU seconds spent by the child."""
+        return self.user_time + self.system_time
+
+
+class OutputTail:
+    """Ring buffer that keeps only the last ``max_bytes`` of a text stream.
+
+    A ``max_bytes`` of None keeps everything.
+    """
+
+    def __init__(self, max_bytes: int | None = DEFAULT_TAIL_BYTES):
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lines: deque[tuple[str, int]] = deque()
+        self._size = 0
+
+    def append(self, text: str) -> None:
+        """Add a chunk of output, evicting the oldest lines past the limit."""
+        size = len(text.encode(errors="replace"))
+        self._lines.append((text, size))
+        self._size += size
+        if self.max_bytes is None:
+            return
+        while self._size > self.max_bytes and self._lines:
+            _, evicted = self._lines.popleft()
+            self._size -= evicted
+            self.dropped += evicted
+
+    def getvalue(self) -> str:
+        """Return the retained output."""
+        return "".join(text for text, _ in self._lines)
+
+
+def _wait(process: subprocess.Popen[Any]) -> tuple[int, Any]:
+    """Reap a child, returning its exit status and its own resource usage.
+
+    ``os.wait4`` reports usage for exactly this child, so the numbers stay
+    accurate when several commands run at once. Platforms without it
+    (Windows) get no usage figures.
+    """
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode, usage
+    return process.wait(), None
+
+
+def _account(
+    result: CommandResult, cmd: list[str], started: float, usage: Any
+) -> CommandResult:
+    """Attach timing and resource usage to a result and record it."""
+    result.command = cmd
+    result.wall_time = time.perf_counter() - started
+    if usage is not None:
+        result.user_time = usage.ru_utime
+        result.system_time = usage.ru_stime
+        result.max_rss = usage.ru_maxrss * _RSS_SCALE
+    if result.returncode < 0:
+        result.signal = -result.returncode
+
+    if _PROFILE is not None:
+        _PROFILE.append(result)
+    return result
+
+
+class CommandStream:
+    """Iterate over a command's stdout lines as they arrive.
+
+    Only the last ``tail_bytes`` of stdout and stderr are kept (None keeps
+    everything); once iteration finishes, ``result`` holds a CommandResult
+    with those tails and the number of bytes dropped from each stream.
+    """
+
+    def __init__(self, cmd: list[str], tail_bytes: int | None = DEFAULT_TAIL_BYTES):
+        self.cmd = cmd
+        self.tail_bytes = tail_bytes
+        self.result: CommandResult | None = None
+
+    def __iter__(self) -> Iterator[str]:
+        stdout_tail = OutputTail(self.tail_bytes)
+        stderr_tail = OutputTail(self.tail_bytes)
+        started = time.perf_counter()
+
+        try:
+            process = subprocess.Popen(
+                self.cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=PROJECT_ROOT,
+            )
+        except OSError as e:
+            self.result = CommandResult(returncode=1, stderr=str(e))
+            return
+
+        def drain_stderr() -> None:
+            assert process.stderr is not None
+            for line in process.stderr:
+                stderr_tail.append(line)
+
+        stderr_reader = threading.Thread(target=drain_stderr, daemon=True)
+        stderr_reader.start()
+
+        finished = False
+        try:
+            assert process.stdout is not None
+            for line in process.stdout:
+                stdout_tail.append(line)
+                yield line
+            finished = True
+        finally:
+            # Stop the child if the consumer bailed out early
+            if not finished:
+                process.kill()
+            returncode, usage = _wait(process)
+            stderr_reader.join()
+            self.result = _account(
+                CommandResult(
+                    returncode=returncode,
+                    stdout=stdout_tail.getvalue(),
+                    stderr=stderr_tail.getvalue(),
+                    stdout_dropped=stdout_tail.dropped,
+                    stderr_dropped=stderr_tail.dropped,
+                ),
+                self.cmd,
+                started,
+                usage,
+            )
+
+
+def stream_command(
+    cmd: list[str], tail_bytes: int = DEFAULT_TAIL_BYTES
+) -> CommandStream:
+    """Run a command in streaming mode with bounded output capture.
+
+    Args:
+        cmd: Command and arguments as list
+        tail_bytes: Bytes of each stream to keep for the final result
+
+    Returns:
+        CommandStream yielding stdout lines; its ``result`` is set at the end
+    """
+    return CommandStream(cmd, tail_bytes=tail_bytes)
+
 
 def run_command(
-    cmd: list[str], capture_output: bool = False, check: bool = True
+    cmd: list[str],
+    capture_output: bool = False,
+    check: bool = True,
+    tail_bytes: int | None = None,
 ) -> CommandResult:
     """Run a shell command with proper error handling.
 
@@ -39,40 +233,54 @@ def run_command(
         cmd: Command and arguments as list
         capture_output: Whether to capture stdout/stderr
         check: Whether to raise on non-zero exit code
+        tail_bytes: Capture in bounded mode, keeping only the last N bytes
+            of each stream (implies capture_output)
 
     Returns:
-        CommandResult with returncode, stdout, stderr
+        CommandResult with returncode, stdout, stderr and resource usage
 
     Raises:
         typer.Exit: If check=True and command fails
     """
-    try:
-        result = subprocess.run(
-            cmd, capture_output=capture_output, text=True, check=False, cwd=PROJECT_ROOT
-        )
-
-        command_result = CommandResult(
-            returncode=result.returncode,
-            stdout=result.stdout if capture_output else "",
-            stderr=result.stderr if capture_output else "",
-        )
-
-        if check and result.returncode != 0:
-            console.print(f"[red]❌ Command failed: {' '.join(cmd)}[/red]")
-            if capture_output:
-                if result.stdout:
-                    console.print(f"[yellow]STDOUT: {result.stdout}[/yellow]")
-                if result.stderr:
-                    console.print(f"[red]STDERR: {result.stderr}[/red]")
-            raise typer.Exit(1)
+    captured = capture_output or tail_bytes is not None
 
-        return command_result
+    try:
+        if captured:
+            stream = CommandStream(cmd, tail_bytes=tail_bytes)
+            for _ in stream:
+                pass
+            assert stream.result is not None
+            result = stream.result
+        else:
+            started = time.perf_counter()
+            process = subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+            returncode, usage = _wait(process)
+            result = _account(CommandResult(returncode), cmd, started, usage)
 
     except Exception as e:
         console.print(f"[red]❌ Unexpected error running command: {e}[/red]")
         if check:
             raise typer.Exit(1)
-        return CommandResult(returncode=1, stderr=str(e))
+        return CommandResult(returncode=1, stderr=str(e), command=cmd)
+
+    if check and not result.success:
+        console.print(f"[red]❌ Command failed: {' '.join(cmd)}[/red]")
+        if captured:
+            if result.stdout:
+                if result.stdout_dropped:
+                    console.print(
+                        f"[yellow]… {result.stdout_dropped} bytes of stdout dropped[/yellow]"
+                    )
+                console.print(f"[yellow]STDOUT: {result.stdout}[/yellow]")
+            if result.stderr:
+                if result.stderr_dropped:
+                    console.print(
+                        f"[red]… {result.stderr_dropped} bytes of stderr dropped[/red]"
+                    )
+                console.print(f"[red]STDERR: {result.stderr}[/red]")
+        raise typer.Exit(1)
+
+    return result
 
 
 def run_command_simple(cmd: list[str]) -> bool:
@@ -98,3 +306,102 @@ def run_command_capture(cmd: list[str]) -> CommandResult:
         CommandResult with captured output
     """
     return run_command(cmd, capture_output=True, check=False)
+
+
+def run_parallel(
+    commands: dict[str, list[str]],
+    max_workers: int | None = None,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+) -> dict[str, CommandResult]:
+    """Run independent commands concurrently on a bounded worker pool.
+
+    Each command goes through ``run_command`` with its output captured, so
+    results can be reported per command once everything has finished. The
+    workers only wait on child processes, so threads are sufficient here.
+
+    Args:
+        commands: Mapping of check name to command and arguments
+        max_workers: Upper bound on concurrent commands (defaults to CPU count)
+        tail_bytes: Bytes of each command's output to keep
+
+    Returns:
+        Mapping of check name to CommandResult, in the order given
+    """
+    if not commands:
+        return {}
+
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(commands)))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(run_command, cmd, check=False, tail_bytes=tail_bytes)
+            for name, cmd in commands.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def enable_profiling() -> None:
+    """Start recording command costs and print them when the process exits."""
+    global _PROFILE
+
+    if _PROFILE is None:
+        _PROFILE = []
+        atexit.register(print_profile)
+
+
+def print_profile() -> None:
+    """Print recorded command costs, most expensive (wall time) first."""
+    if not _PROFILE:
+        return
+
+    table = Table(title="Command Costs", show_header=True, header_style="bold magenta")
+    table.add_column("Command", style="cyan", overflow="fold")
+    table.add_column("Wall", justify="right")
+    table.add_column("User", justify="right")
+    table.add_column("Sys", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    table.add_column("Exit", justify="center")
+
+    for result in sorted(_PROFILE, key=lambda r: r.wall_time, reverse=True):
+        if result.signal is not None:
+            exit_status = f"signal {result.signal}"
+        else:
+            exit_status = str(result.returncode)
+        table.add_row(
+            " ".join(result.command),
+            f"{result.wall_time:.2f}s",
+            f"{result.user_time:.2f}s",
+            f"{result.system_time:.2f}s",
+            _format_bytes(result.max_rss),
+            exit_status,
+        )
+
+    total_wall = sum(r.wall_time for r in _PROFILE)
+    total_cpu = sum(r.cpu_time for r in _PROFILE)
+    table.caption = (
+        f"{len(_PROFILE)} commands, {total_wall:.2f}s wall, {total_cpu:.2f}s CPU"
+    )
+    console.print(table)
+
+
+def _format_bytes(size: int | None) -> str:
+    """Render a byte count for the cost table."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def profile_option(
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-command cost table at exit"
+    ),
+) -> None:
+    """Shared app callback adding --profile to every script."""
+    if profile:
+        enable_profiling()
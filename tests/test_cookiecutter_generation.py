@@ -3,6 +3,7 @@ Test cookiecutter template generation with different configurations.
 """
 
 import json
+import re
 
 import pytest
 
@@ -57,6 +58,28 @@ def test_mongodb_generation(cookies, mongodb_context):
     assert "pymongo" in pixi_content
     assert "motor" in pixi_content  # async MongoDB driver
 
+    # One client per session; each test gets its own collection, dropped afterwards
+    conftest = (project_dir / "tests" / "conftest.py").read_text()
+    assert '@pytest.fixture(scope="session")\ndef mongodb_client' in conftest
+    assert "collection.drop()" in conftest
+
+    ephemeral = (project_dir / "infrastructure" / "docker-compose.ephemeral.yml").read_text()
+    assert "target: /data/db" in ephemeral
+
+    # Unordered, BSON-sized batches across a thread pool; indexes after the load
+    init_script = (project_dir / "infrastructure" / "test-data" / "init_mongodb.py").read_text()
+    assert "insert_many(batch, ordered=False)" in init_script
+    assert "count_documents" not in init_script
+    assert init_script.index("load_collection(collection") < init_script.index(".create_index(")
+
+    # The package gets a pooled client, exported lazily so drivers load on first use
+    package_dir = project_dir / mongodb_context["package_name"]
+    db_module = (package_dir / "db.py").read_text()
+    assert "maxPoolSize=sizes[1]" in db_module
+    assert "def pool_stats() -> PoolStats" in db_module
+    assert "atexit.register(close_pool)" in db_module
+    assert '"get_client": ".db"' in (package_dir / "__init__.py").read_text()
+
 
 def test_postgresql_generation(cookies, postgresql_context):
     """Test generating cookiecutter with PostgreSQL integration."""
@@ -78,6 +101,43 @@ def test_postgresql_generation(cookies, postgresql_context):
     assert "psycopg2" in pixi_content
     assert "asyncpg" in pixi_content  # async PostgreSQL driver
 
+    # One connection per session; each test is rolled back to a savepoint
+    conftest = (project_dir / "tests" / "conftest.py").read_text()
+    assert "def postgres_session_connection" in conftest
+    assert "ROLLBACK TO SAVEPOINT test_case" in conftest
+
+    # Test databases are cloned from a template seeded once per schema/data hash
+    init_script = (
+        project_dir / "infrastructure" / "test-data" / "init_postgresql.py"
+    ).read_text()
+    assert "CREATE DATABASE {} TEMPLATE {}" in init_script
+    assert "def seed_fingerprint" in init_script
+    # Bulk loaded with COPY into unlogged tables, keys added afterwards
+    assert "FROM STDIN WITH (FORMAT csv)" in init_script
+    assert "CREATE UNLOGGED TABLE test_orders" in init_script
+    assert "executemany" not in init_script
+    assert "postgres_seed.clone_database" in conftest
+
+    # Opt-in tmpfs profile with durability off, layered by 'test db start --ephemeral'
+    ephemeral = (project_dir / "infrastructure" / "docker-compose.ephemeral.yml").read_text()
+    assert "fsync=off" in ephemeral
+    assert "synchronous_commit=off" in ephemeral
+    assert "type: tmpfs" in ephemeral
+
+    # Threaded pool for sync code, asyncpg pool alongside it when use_async is on
+    package_dir = project_dir / postgresql_context["package_name"]
+    db_module = (package_dir / "db.py").read_text()
+    assert "class _ThreadedPool(pool.ThreadedConnectionPool)" in db_module
+    assert "await asyncpg.create_pool(" in db_module
+    assert "def health_check() -> bool" in db_module
+    assert '"get_pool": ".db"' in (package_dir / "__init__.py").read_text()
+
+    # Large results stream through named server-side cursors and asyncpg cursors
+    streaming = (package_dir / "streaming.py").read_text()
+    assert 'active.cursor(name=f"stream_{uuid4().hex}")' in streaming
+    assert "await statement.cursor(*args)" in streaming
+    assert "slots=True" in streaming
+
 
 def test_project_structure(cookies, default_context):
     """Test that generated project has correct structure."""
@@ -168,7 +228,7 @@ def test_script_imports(cookies, default_context):
             script_path.exists() and script_path.stat().st_size > 0
         ):  # test_db.py may be empty with no database
             script_content = script_path.read_text()
-            assert "from utils import run_command" in script_content
+            assert re.search(r"^from utils import .*\brun_command\b", script_content, re.MULTILINE)
             assert (
                 "subprocess" not in script_content
             )  # Ensure subprocess is not imported
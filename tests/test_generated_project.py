@@ -61,6 +61,37 @@ def test_package_imports(cookies, default_context, command_runner):
     assert import_result.returncode == 0
 
 
+def test_package_exports_load_lazily(cookies, default_context, command_runner):
+    """Test that names in _LAZY_EXPORTS import their submodule on first access."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+    package_name = default_context["package_name"]
+    package_dir = project_dir / package_name
+
+    (package_dir / "core.py").write_text("class MainClass:\n    pass\n")
+    init = package_dir / "__init__.py"
+    init.write_text(init.read_text().replace(
+        '    # "main_function": ".core",\n',
+        '    # "main_function": ".core",\n    "MainClass": ".core",\n',
+    ))
+
+    script = (
+        "import sys; sys.path.insert(0, '.')\n"
+        f"import {package_name} as package\n"
+        f"assert '{package_name}.core' not in sys.modules\n"
+        "assert 'MainClass' in dir(package) and 'MainClass' in package.__all__\n"
+        "assert package.MainClass.__name__ == 'MainClass'\n"
+        f"assert '{package_name}.core' in sys.modules\n"
+        "try:\n"
+        "    package.missing\n"
+        "except AttributeError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('missing attribute resolved')\n"
+    )
+    command_runner(project_dir, [sys.executable, "-c", script])
+
+
 def test_script_help_commands(cookies, default_context, command_runner):
     """Test that all scripts respond to --help."""
     result = cookies.bake(extra_context=default_context)
@@ -2,6 +2,8 @@
 Test the sh-based script functionality specifically.
 """
 
+import json
+import re
 import subprocess
 import sys
 
@@ -45,7 +47,7 @@ def test_scripts_use_utils(cookies, default_context):
         script_content = script_path.read_text()
 
         # Should import from utils
-        assert "from utils import run_command" in script_content
+        assert re.search(r"^from utils import .*\brun_command\b", script_content, re.MULTILINE)
 
         # Should not import subprocess
         assert "import subprocess" not in script_content
@@ -64,7 +66,7 @@ def test_database_script_uses_utils(cookies, mongodb_context):
         script_content = test_db_path.read_text()
 
         # Should import from utils
-        assert "from utils import run_command" in script_content
+        assert re.search(r"^from utils import .*\brun_command\b", script_content, re.MULTILINE)
 
         # Should not import subprocess
         assert "import subprocess" not in script_content
@@ -238,3 +240,501 @@ def test_backward_compatibility_removed(cookies, default_context):
             code_lines = [line for line in lines if not line.strip().startswith("#")]
             code_content = "\n".join(code_lines)
             assert "result.returncode" not in code_content
+
+
+def test_quality_check_runs_in_parallel(cookies, default_context):
+    """Test that quality check fans out through the shared runner."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+    scripts_dir = project_dir / "scripts"
+
+    utils_content = (scripts_dir / "utils.py").read_text()
+    assert "def run_parallel(" in utils_content
+    assert "gather_commands" in utils_content
+
+    quality_content = (scripts_dir / "quality.py").read_text()
+    assert "from cache import run_cached, run_parallel_cached" in quality_content
+    assert "CHECKS = {" in quality_content
+    assert '"--jobs"' in quality_content
+
+
+def test_run_parallel_captures_each_command(cookies, default_context, command_runner):
+    """Test that run_parallel returns separately captured results per command."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    script = (
+        "import sys; sys.path.insert(0, 'scripts'); import utils; "
+        "out = utils.run_parallel({"
+        "'a': ['echo', 'first'], 'b': ['echo', 'second'], 'c': ['false']"
+        "}, max_workers=2); "
+        "print(out['a'].stdout.strip(), out['b'].stdout.strip(), "
+        "out['a'].success, out['c'].success)"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split() == ["first", "second", "True", "False"]
+
+
+def test_streaming_capture_is_bounded(cookies, default_context, command_runner):
+    """Test that streaming mode yields every line but keeps only a tail."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    script = (
+        "import sys; sys.path.insert(0, 'scripts'); import utils; "
+        "stream = utils.stream_command(['seq', '1', '5000'], tail_bytes=64); "
+        "count = sum(1 for _ in stream); r = stream.result; "
+        "print(count, r.success, len(r.stdout.encode()) <= 64, "
+        "r.stdout.split()[-1], r.stdout_dropped > 0, r.truncated)"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split() == ["5000", "True", "True", "5000", "True", "True"]
+
+
+def test_profile_records_command_costs(cookies, default_context, command_runner):
+    """Test that --profile is wired into the scripts and costs are recorded."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    for script_name in ["build", "dev", "docs", "quality", "test"]:
+        content = (project_dir / "scripts" / f"{script_name}.py").read_text()
+        assert "callback=profile_option" in content
+
+    script = (
+        "import sys; sys.path.insert(0, 'scripts'); import utils; "
+        "utils.enable_profiling(); "
+        "r = utils.run_command(['sleep', '0.2'], capture_output=True, check=False); "
+        "print(r.command == ['sleep', '0.2'], r.wall_time >= 0.2, "
+        "len(utils._PROFILE), r.signal)"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split()[:4] == ["True", "True", "1", "None"]
+    assert "Command Costs" in run_result.stdout
+
+    # Children totals cannot be split between overlapping commands
+    script = (
+        "import asyncio, sys; sys.path.insert(0, 'scripts'); import async_utils; "
+        "cmds = {'a': ['sleep', '0.2'], 'b': ['sleep', '0.1']}; "
+        "both = asyncio.run(async_utils.gather_commands(cmds, limit=2)); "
+        "solo = asyncio.run(async_utils.gather_commands(cmds, limit=1)); "
+        "print([r.usage_approximate for r in [*both.values(), *solo.values()]])"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.strip() == "[True, True, False, False]"
+
+
+def test_gather_commands_cancels_on_first_failure(cookies, default_context, command_runner):
+    """Test that the asyncio runner stops the remaining commands after a failure."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    script = (
+        "import asyncio, sys, time; sys.path.insert(0, 'scripts'); import async_utils; "
+        "cmds = {'slow': ['sleep', '5'], 'bad': ['false'], 'queued': ['sleep', '5']}; "
+        "start = time.monotonic(); "
+        "r = asyncio.run(async_utils.gather_commands(cmds, limit=2)); "
+        "print(time.monotonic() - start < 4, sorted(r), r['bad'].returncode)"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split() == ["True", "['bad']", "1"]
+
+    # Without a tail limit every byte is still captured, not sent to the terminal
+    script = (
+        "import asyncio, sys; sys.path.insert(0, 'scripts'); import async_utils; "
+        "cmd = [sys.executable, '-c', 'print(\"x\" * 100000)']; "
+        "r = asyncio.run(async_utils.gather_commands({'big': cmd}, tail_bytes=None)); "
+        "print(len(r['big'].stdout), r['big'].stdout_dropped)"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split() == ["100001", "0"]
+
+
+def test_result_cache_replays_unchanged_runs(cookies, default_context, command_runner):
+    """Test that cached tool results are replayed until an input changes."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    quality_content = (project_dir / "scripts" / "quality.py").read_text()
+    assert '"--no-cache"' in quality_content
+
+    script = (
+        "import sys; from pathlib import Path; sys.path.insert(0, 'scripts'); import cache; "
+        "tool = [sys.executable, '-c', "
+        "'open(\"runs.txt\", \"a\").write(\"x\"); print(\"checked\")']; "
+        "inputs = [Path('tests')]; "
+        "first = cache.run_cached(tool, inputs); second = cache.run_cached(tool, inputs); "
+        "Path('tests/new_file.py').write_text('x = 1\\n'); "
+        "third = cache.run_cached(tool, inputs); "
+        "cache.run_cached(tool, inputs, use_cache=False); "
+        "print(first.cached, second.cached, second.stdout.strip(), third.cached, "
+        "Path('runs.txt').read_text())"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split() == ["False", "True", "checked", "False", "xxx"]
+
+    # Inputs outside the project are hashed by absolute path instead of failing
+    outside = project_dir.parent / "outside.txt"
+    outside.write_text("a")
+    (project_dir / "linked.txt").symlink_to(outside)
+    script = (
+        "import sys; from pathlib import Path; sys.path.insert(0, 'scripts'); import cache; "
+        f"inputs = [[Path('linked.txt')], [Path({str(outside)!r})]]; "
+        "before = [cache.digest_inputs(paths) for paths in inputs]; "
+        f"Path({str(outside)!r}).write_text('b'); "
+        "after = [cache.digest_inputs(paths) for paths in inputs]; "
+        "print(before[0] == before[1], before[0] != after[0], before[1] != after[1])"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split() == ["True", "True", "True"]
+
+
+def test_cli_loads_subcommands_lazily(cookies, default_context, command_runner):
+    """Test that the single entry point imports scripts only when needed."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    pixi_content = (project_dir / "pixi.toml").read_text()
+    assert 'clean = { cmd = "python scripts/cli.py clean"' in pixi_content
+
+    script = (
+        "import sys; sys.path.insert(0, 'scripts'); import cli; "
+        "code = cli.run_in_process('dev', ['--help']); "
+        "print(code, 'dev' in sys.modules, 'quality' in sys.modules)"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    assert run_result.stdout.split()[-3:] == ["0", "True", "False"]
+
+    clean_result = command_runner(project_dir, [sys.executable, "scripts/cli.py", "clean"])
+    assert clean_result.returncode == 0
+    assert "Cleaning development artifacts" in clean_result.stdout
+
+
+def test_task_graph_skips_and_blocks(cookies, default_context, command_runner):
+    """Test that the task graph skips up-to-date tasks and blocks dependents of failures."""
+    result = cookies.bake(extra_context=default_context)
+    project_dir = result.project_path
+
+    pixi_content = (project_dir / "pixi.toml").read_text()
+    assert 'check-all = { cmd = "python scripts/cli.py check-all"' in pixi_content
+
+    script = (
+        "import sys; sys.path.insert(0, 'scripts'); from tasks import Task, run_graph; "
+        "graph = [Task('fail', ['build', 'check'], in_process=True), "
+        "Task('after', ['dev', 'clean'], deps=('fail',), in_process=True), "
+        "Task('cached', ['dev', 'clean'], inputs=('README.md',), in_process=True)]; "
+        "first = run_graph(graph); second = run_graph(graph); "
+        "print('RESULT', *(o.status for o in first.values()), "
+        "*(o.status for o in second.values()))"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    result_line = run_result.stdout.split("RESULT")[-1].split()
+    assert result_line == ["failed", "blocked", "passed", "failed", "blocked", "skipped"]
+
+    # A task that raises fails on its own; the rest of the graph still runs
+    script = (
+        "import sys; sys.path.insert(0, 'scripts'); import tasks; "
+        "from tasks import Task, run_graph; "
+        "tasks.STATE_PATH.unlink(); "
+        "graph = [Task('crash', ['no-such-script'], in_process=True), "
+        "Task('after', ['dev', 'clean'], deps=('crash',), in_process=True), "
+        "Task('cached', ['dev', 'clean'], inputs=('README.md',), in_process=True)]; "
+        "outcomes = run_graph(graph); "
+        "print('RESULT', *(o.status for o in outcomes.values()), tasks.STATE_PATH.exists())"
+    )
+    run_result = command_runner(project_dir, [sys.executable, "-c", script])
+    result_line = run_result.stdout.split("RESULT")[-1].split()
+    assert result_line == ["failed", "blocked", "passed", "True"]
+    assert "KeyError" in run_result.stdout
+
+
+def test_sharded_test_run_merges_reports(cookies, minimal_context, command_runner):
+    """Test that --workers splits tests into disjoint shards and merges JUnit output."""
+    result = cookies.bake(extra_context=minimal_context)
+    project_dir = result.project_path
+
+    unit_dir = project_dir / "tests" / "unit"
+    for test_file in unit_dir.glob("test_*.py"):
+        test_file.unlink()
+    for index in range(3):
+        (unit_dir / f"test_sample_{index}.py").write_text(
+            "".join(f"def test_case_{case}():\n    assert True\n\n" for case in range(4))
+        )
+
+    # -qq offsets the generated project's --verbose addopts to list node ids
+    shards = []
+    for index in range(2):
+        collect = command_runner(
+            project_dir,
+            [sys.executable, "-m", "pytest", "tests/unit", f"--shard={index}/2",
+             "--collect-only", "-qq", "-p", "no:cacheprovider"],
+        )
+        shards.append({line for line in collect.stdout.splitlines() if "::" in line})
+    assert len(shards[0]) + len(shards[1]) == 12
+    assert not shards[0] & shards[1]
+
+    run_result = command_runner(
+        project_dir,
+        [sys.executable, "scripts/test.py", "unit", "--workers", "2", "--no-coverage"],
+    )
+    assert "Test Shards" in run_result.stdout
+    junit = (project_dir / ".cache" / "test-shards" / "junit.xml").read_text()
+    assert 'tests="12"' in junit
+
+
+def test_shards_balance_recorded_durations(cookies, minimal_context, command_runner):
+    """Test that shards split by recorded runtime and every run records durations."""
+    result = cookies.bake(extra_context=minimal_context)
+    project_dir = result.project_path
+
+    unit_dir = project_dir / "tests" / "unit"
+    for test_file in unit_dir.glob("test_*.py"):
+        test_file.unlink()
+    (unit_dir / "test_sample.py").write_text(
+        "".join(f"def test_case_{case}():\n    assert True\n\n" for case in range(6))
+    )
+
+    # One test has historically taken as long as all the others together, twice over
+    nodeids = [f"tests/unit/test_sample.py::test_case_{case}" for case in range(6)]
+    store = project_dir / ".cache" / "test-durations" / "durations.jsonl"
+    store.parent.mkdir(parents=True)
+    store.write_text(json.dumps({
+        "run": "earlier",
+        "at": 0,
+        "durations": {nodeid: 10.0 if nodeid == nodeids[0] else 1.0 for nodeid in nodeids},
+    }) + "\n")
+
+    shards = []
+    for index in range(2):
+        collect = command_runner(
+            project_dir,
+            [sys.executable, "-m", "pytest", "tests/unit", f"--shard={index}/2",
+             "--collect-only", "-qq", "-p", "no:cacheprovider"],
+        )
+        shards.append({line for line in collect.stdout.splitlines() if "::" in line})
+    assert shards[0] == {nodeids[0]}
+    assert shards[1] == set(nodeids[1:])
+
+    command_runner(
+        project_dir,
+        [sys.executable, "scripts/test.py", "unit", "--workers", "2", "--no-coverage"],
+    )
+    records = [json.loads(line) for line in store.read_text().splitlines()]
+    assert len(records) == 3
+    assert records[1]["run"] == records[2]["run"] != "earlier"
+    assert set(records[1]["durations"]) | set(records[2]["durations"]) == set(nodeids)
+
+    report = command_runner(project_dir, [sys.executable, "scripts/test.py", "durations"])
+    assert "Slowest Tests" in report.stdout
+    assert "2 runs recorded" in report.stdout
+
+
+def test_affected_runs_only_impacted_tests(cookies, minimal_context, command_runner):
+    """Test that 'test affected' maps tests to source lines and reruns only those hit."""
+    result = cookies.bake(extra_context=minimal_context)
+    project_dir = result.project_path
+    package = minimal_context["package_name"]
+
+    unit_dir = project_dir / "tests" / "unit"
+    for test_file in unit_dir.glob("test_*.py"):
+        test_file.unlink()
+    module = project_dir / package / "calc.py"
+    module.write_text("def add(a, b):\n    return a + b\n\n\ndef mul(a, b):\n    return a * b\n")
+    for name, call in [("add", "add(2, 3) == 5"), ("mul", "mul(2, 3) == 6")]:
+        (unit_dir / f"test_{name}.py").write_text(
+            f"from {package}.calc import {name}\n\n\ndef test_{name}():\n    assert {call}\n"
+        )
+
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    command_runner(project_dir, ["git", "init", "-q"])
+    command_runner(project_dir, ["git", "add", "-A"])
+    command_runner(project_dir, [*git, "commit", "-q", "-m", "initial"])
+
+    affected = [sys.executable, "scripts/test.py", "affected"]
+    first = command_runner(project_dir, affected)
+    assert "no test impact map recorded yet" in first.stdout
+
+    module.write_text(module.read_text().replace("return a * b", "return b * a"))
+    second = command_runner(project_dir, affected)
+    assert "1 affected test" in second.stdout
+    selection = project_dir / ".cache" / "test-impact" / "selected.txt"
+    assert selection.read_text().split() == ["tests/unit/test_mul.py::test_mul"]
+
+    command_runner(project_dir, [*git, "commit", "-q", "-a", "-m", "swap"])
+    third = command_runner(project_dir, affected)
+    assert "No tests affected" in third.stdout
+
+
+def test_bench_saves_baselines_and_flags_regressions(cookies, minimal_context, command_runner):
+    """Test that 'test bench' stores per-commit baselines and fails on slowdowns."""
+    result = cookies.bake(extra_context=minimal_context)
+    project_dir = result.project_path
+
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    command_runner(project_dir, ["git", "init", "-q"])
+    command_runner(project_dir, ["git", "add", "-A"])
+    command_runner(project_dir, [*git, "commit", "-q", "-m", "initial"])
+    commit = command_runner(project_dir, ["git", "rev-parse", "HEAD"]).stdout.strip()
+
+    bench = [sys.executable, "scripts/test.py", "bench"]
+    first = command_runner(project_dir, bench)
+    assert "Saved baseline" in first.stdout
+    baseline_path = project_dir / ".cache" / "benchmarks" / f"{commit}.json"
+    baseline = json.loads(baseline_path.read_text())
+    assert baseline["commit"] == commit
+    stats = next(iter(baseline["results"].values()))
+    assert stats["min"] <= stats["median"] <= stats["p99"]
+    assert stats["iterations"] >= 1
+
+    # Pretend the baseline was far faster than anything this run can achieve
+    for stats in baseline["results"].values():
+        stats["median"] /= 1000
+    baseline_path.write_text(json.dumps(baseline))
+    slowed = baseline_path.read_text()
+    second = command_runner(project_dir, bench, check=False)
+    assert second.returncode == 1
+    assert "slower than 10%" in second.stdout
+    # The regressed run must not replace the baseline it was judged by
+    assert "Saved baseline" not in second.stdout
+    assert baseline_path.read_text() == slowed
+
+    # A passing run keeps an existing baseline unless told to replace it
+    lenient = [*bench, "--threshold", "1000000"]
+    third = command_runner(project_dir, lenient)
+    assert "already saved" in third.stdout
+    assert baseline_path.read_text() == slowed
+    fourth = command_runner(project_dir, [*lenient, "--overwrite"])
+    assert "Saved baseline" in fourth.stdout
+    assert baseline_path.read_text() != slowed
+
+
+def test_importtime_enforces_pyproject_budget(cookies, minimal_context, command_runner):
+    """Test that 'quality importtime' fails on submodules over budget until raised."""
+    result = cookies.bake(extra_context=minimal_context)
+    project_dir = result.project_path
+    package = minimal_context["package_name"]
+
+    (project_dir / package / "slow.py").write_text("import time\n\ntime.sleep(0.08)\n")
+    init = project_dir / package / "__init__.py"
+    init.write_text(init.read_text() + "\nfrom . import slow\n")
+
+    importtime = [sys.executable, "scripts/quality.py", "importtime", "--runs", "1"]
+    over = command_runner(project_dir, importtime, check=False)
+    assert over.returncode == 1
+    assert f"{package}.slow" in over.stdout
+    assert "Over the import-time budget" in over.stdout
+
+    pyproject = project_dir / "pyproject.toml"
+    pyproject.write_text(
+        pyproject.read_text()
+        .replace("total_ms = 100", "total_ms = 1000")
+        .replace("[tool.importtime.submodules]\n", f'[tool.importtime.submodules]\n"{package}.slow" = 1000\n')
+    )
+    within = command_runner(project_dir, importtime)
+    assert "Import time within budget" in within.stdout
+
+
+def test_memprofile_reports_peaks_and_enforces_budgets(cookies, minimal_context, command_runner):
+    """Test that --memprofile writes a per-test report and memory_budget fails tests."""
+    result = cookies.bake(extra_context=minimal_context)
+    project_dir = result.project_path
+
+    unit_dir = project_dir / "tests" / "unit"
+    for test_file in unit_dir.glob("test_*.py"):
+        test_file.unlink()
+    (unit_dir / "test_memory.py").write_text(
+        "import pytest\n\n"
+        "retained = []\n\n\n"
+        "@pytest.mark.memory_budget(\"1MB\")\n"
+        "def test_over_budget():\n"
+        "    assert len([bytes(1024) for _ in range(4096)]) == 4096\n\n\n"
+        "@pytest.mark.memory_budget(\"64MB\")\n"
+        "def test_within_budget():\n"
+        "    retained.append(bytearray(2 * 1024 * 1024))\n"
+    )
+
+    run = command_runner(
+        project_dir,
+        [sys.executable, "scripts/test.py", "unit", "--no-coverage", "--memprofile"],
+        check=False,
+    )
+    assert run.returncode == 1
+
+    report = json.loads((project_dir / ".cache" / "test-memory" / "report.json").read_text())
+    over = report["tests/unit/test_memory.py::test_over_budget"]
+    within = report["tests/unit/test_memory.py::test_within_budget"]
+    assert over["peak"] > 1024 * 1024
+    assert within["top"][0]["site"].startswith("tests/unit/test_memory.py:")
+    assert within["top"][0]["size"] >= 2 * 1024 * 1024
+
+    plain = command_runner(
+        project_dir,
+        [sys.executable, "-m", "pytest", "tests/unit", "-p", "no:cacheprovider",
+         "-k", "within_budget"],
+    )
+    assert "1 passed" in plain.stdout
+
+
+def test_db_readiness_probe_backs_off(cookies, postgresql_context, command_runner):
+    """Test that test_db.py probes in-process, retrying with exponential backoff."""
+    result = cookies.bake(extra_context=postgresql_context)
+    project_dir = result.project_path
+
+    probe = """
+import os, socket, sys
+listener = socket.create_server(("127.0.0.1", 0))
+os.environ["DATABASE_URL"] = f"postgresql://u:p@127.0.0.1:{listener.getsockname()[1]}/db"
+sys.path.insert(0, "scripts")
+import test_db
+pings = []
+def ping():
+    pings.append(1)
+    return len(pings) == 3
+assert test_db.wait_until_ready("PostgreSQL", ping, timeout=5)
+assert not test_db.wait_until_ready("PostgreSQL", lambda: False, timeout=0.2)
+listener.close()
+assert not test_db.is_port_open()
+"""
+    run = command_runner(project_dir, [sys.executable, "-c", probe])
+    assert "3 probes)" in run.stdout
+    assert "did not become ready within 0.2 seconds" in run.stdout
+
+
+def test_synthetic_seed_data_is_deterministic(cookies, postgresql_context, command_runner):
+    """Test that --scale data is reproducible chunk by chunk with valid foreign keys."""
+    result = cookies.bake(extra_context=postgresql_context)
+    seed_dir = result.project_path / "infrastructure" / "test-data"
+
+    check = """
+import synthetic
+users = {row[0] for chunk in synthetic.chunks("test_users", 3) for row in chunk}
+orders = [row for chunk in synthetic.chunks("test_orders", 3) for row in chunk]
+assert len(users) == 3 * synthetic.ROWS_PER_SCALE["test_users"]
+assert len(orders) == 3 * synthetic.ROWS_PER_SCALE["test_orders"]
+assert all(order[1] in users for order in orders)
+assert synthetic.generate_chunk("test_orders", 3, 1) == orders[synthetic.CHUNK_SIZE:2 * synthetic.CHUNK_SIZE]
+assert synthetic.as_documents("test_users", synthetic.generate_chunk("test_users", 1, 0))[0]["_id"] == "user1"
+"""
+    command_runner(seed_dir, [sys.executable, "-c", check])
+
+
+def test_seed_snapshots_round_trip_and_prune(cookies, postgresql_context, command_runner):
+    """Test that seed snapshots are saved atomically, restored, and pruned per backend."""
+    result = cookies.bake(extra_context=postgresql_context)
+    seed_dir = result.project_path / "infrastructure" / "test-data"
+
+    check = """
+import snapshots
+paths = [snapshots.snapshot_path("postgresql", snapshots.content_hash({"scale": n})) for n in range(5)]
+for number, path in enumerate(paths):
+    assert snapshots.save_snapshot(["printf", f"dump {number}"], path, "postgresql")
+assert not snapshots.save_snapshot(["false"], paths[0], "postgresql")
+kept = sorted(snapshots.SNAPSHOT_DIR.glob("postgresql-*.archive"))
+assert kept == sorted(paths[-snapshots.SNAPSHOTS_KEPT:]), kept
+assert not list(snapshots.SNAPSHOT_DIR.glob("*.tmp"))
+assert snapshots.restore_snapshot(["cat"], paths[-1])
+assert not snapshots.restore_snapshot(["false"], paths[-1])
+print("restored ok")
+"""
+    run = command_runner(seed_dir, [sys.executable, "-c", check])
+    assert "dump 4" in run.stdout
+    assert (result.project_path / ".cache" / "seed-snapshots").is_dir()
@@ -2,84 +2,225 @@
 #!/usr/bin/env python3
 """
 MongoDB test database initialization script.
+Run with --scale N to load synthetic data (see synthetic.py) instead of the
+sample documents. Documents are inserted in parallel, unordered batches and
+secondary indexes are built once the data is in. The database records the
+fingerprint of its data, so seeding the same data again is skipped, and a
+mongodump archive of each dataset is restored instead of regenerating it.
 """
 
+import argparse
 import os
 import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import bson
 from pymongo import MongoClient
 
+import snapshots
+import synthetic
+
+# Target encoded size of one insert_many batch (the server caps a message at 48MB)
+BATCH_BYTES = 4 * 1024 * 1024
+
+# Server limit on the number of documents in one write batch
+MAX_BATCH_DOCUMENTS = 100_000
+
+# Concurrent insert_many calls; each thread waits on the server, not the GIL
+LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+SAMPLE_DATA = {
+    "test_users": [
+        {"_id": "user1", "name": "Alice Johnson", "age": 30, "active": True, "email": "alice@example.com"},
+        {"_id": "user2", "name": "Bob Smith", "age": 25, "active": True, "email": "bob@example.com"},
+        {"_id": "user3", "name": "Charlie Brown", "age": 35, "active": False, "email": "charlie@example.com"},
+        {"_id": "user4", "name": "Diana Prince", "age": 28, "active": True, "email": "diana@example.com"},
+        {"_id": "user5", "name": "Eve Wilson", "age": 22, "active": False, "email": "eve@example.com"}
+    ],
+    "test_orders": [
+        {"_id": "order1", "user_id": "user1", "total": 100.50, "status": "completed", "items": 3},
+        {"_id": "order2", "user_id": "user2", "total": 75.25, "status": "pending", "items": 2},
+        {"_id": "order3", "user_id": "user1", "total": 200.00, "status": "completed", "items": 5},
+        {"_id": "order4", "user_id": "user3", "total": 50.75, "status": "cancelled", "items": 1},
+        {"_id": "order5", "user_id": "user4", "total": 150.00, "status": "completed", "items": 4}
+    ],
+    "test_products": [
+        {"_id": "prod1", "name": "Widget A", "price": 19.99, "category": "widgets", "in_stock": True},
+        {"_id": "prod2", "name": "Gadget B", "price": 29.99, "category": "gadgets", "in_stock": True},
+        {"_id": "prod3", "name": "Tool C", "price": 39.99, "category": "tools", "in_stock": False},
+        {"_id": "prod4", "name": "Device D", "price": 49.99, "category": "devices", "in_stock": True},
+        {"_id": "prod5", "name": "Component E", "price": 9.99, "category": "components", "in_stock": True}
+    ]
+}
+
+
+# Secondary indexes, built after the load: (collection, key, options)
+INDEXES = [
+    ("test_users", "email", {"unique": True}),
+    ("test_users", "active", {}),
+    ("test_orders", "user_id", {}),
+    ("test_orders", "status", {}),
+    ("test_products", "category", {}),
+    ("test_products", "in_stock", {}),
+]
+
+
+# Holds a single document recording which seed data the database holds
+SEED_METADATA_COLLECTION = "seed_metadata"
+
+
+def seed_fingerprint(scale: int = 0) -> str:
+    """Hash the seed data and indexes; a new hash means the data must be reloaded."""
+    if scale:
+        # The generator's code defines the data
+        data = {"scale": scale, "generator": Path(synthetic.__file__).read_text()}
+    else:
+        data = SAMPLE_DATA
+    return snapshots.content_hash({"data": data, "indexes": INDEXES})
+
+
+def stored_fingerprint(db) -> str | None:
+    """Fingerprint of the seed data the database holds, if it is known."""
+    metadata = db[SEED_METADATA_COLLECTION].find_one({"_id": "seed"})
+    return metadata["fingerprint"] if metadata else None
+
+
+def documents(collection_name: str, scale: int) -> Iterator[dict]:
+    """Yield the documents to load into a collection, generating them lazily."""
+    if not scale:
+        yield from SAMPLE_DATA[collection_name]
+        return
+    for rows in synthetic.chunks(collection_name, scale):
+        yield from synthetic.as_documents(collection_name, rows)
+
+
+def bson_batches(docs: Iterable[dict], max_bytes: int = BATCH_BYTES) -> Iterator[list[dict]]:
+    """Group documents into batches of about ``max_bytes`` of encoded BSON."""
+    batch: list[dict] = []
+    batch_bytes = 0
+    for document in docs:
+        size = len(bson.encode(document))
+        if batch and (batch_bytes + size > max_bytes or len(batch) >= MAX_BATCH_DOCUMENTS):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(document)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def load_collection(collection, docs: Iterable[dict], workers: int = LOAD_WORKERS) -> int:
+    """Insert documents with unordered insert_many calls across a thread pool.
+
+    At most two batches per worker are in flight, so generation never runs
+    far ahead of the server. Returns the number of documents inserted.
+    """
+    inserted = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in bson_batches(docs):
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                inserted += sum(future.result() for future in done)
+            pending.add(pool.submit(_insert_batch, collection, batch))
+        inserted += sum(future.result() for future in pending)
+    return inserted
 
-def initialize_test_database():
-    """Initialize MongoDB test database with sample data."""
+
+def _insert_batch(collection, batch: list[dict]) -> int:
+    return len(collection.insert_many(batch, ordered=False).inserted_ids)
+
+
+def _mongo_tool(tool: str, mongodb_uri: str, container: str | None) -> list[str] | None:
+    """Command running mongodump or mongorestore on an archive stream, if available."""
+    prefix = snapshots.tool_command(tool, container)
+    if prefix is None:
+        return None
+    if container:
+        # Inside the container the server listens on its default port
+        return [*prefix, "--archive", "--quiet"]
+    return [*prefix, f"--uri={mongodb_uri}", "--archive", "--quiet"]
+
+
+def seed_collections(db, scale: int, workers: int) -> None:
+    """Drop and load every collection, then build the indexes."""
+    for collection_name in SAMPLE_DATA:
+        collection = db[collection_name]
+
+        # Clear existing data
+        collection.drop()
+
+        # Insert new data
+        started = time.perf_counter()
+        inserted = load_collection(collection, documents(collection_name, scale), workers)
+        elapsed = time.perf_counter() - started
+        print(
+            f"✅ Loaded {inserted:,} documents into {collection_name} in {elapsed:.2f}s "
+            f"({inserted / max(elapsed, 1e-9):,.0f} documents/s)"
+        )
+
+    # Create indexes once the data is in: one sort per index, not one update per insert
+    started = time.perf_counter()
+    for collection_name, key, options in INDEXES:
+        db[collection_name].create_index(key, **options)
+
+    print(f"✅ Created indexes for test collections in {time.perf_counter() - started:.2f}s")
+
+
+def initialize_test_database(scale: int = 0, workers: int = LOAD_WORKERS, container: str | None = None):
+    """Initialize MongoDB test database with sample or synthetic data.
+
+    Nothing is done when the database already holds this seed data.
+    ``container`` runs mongodump and mongorestore inside docker.
+    """
     # Connection configuration
     mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
     database_name = "{{ cookiecutter.package_name }}_test"
-    
+
     try:
         # Connect to MongoDB
         client = MongoClient(mongodb_uri)
         db = client[database_name]
-        
+
         # Test connection
         client.admin.command('ping')
         print(f"✅ Connected to MongoDB at {mongodb_uri}")
-        
-        # Initialize test collections with sample data
-        collections_data = {
-            "test_users": [
-                {"_id": "user1", "name": "Alice Johnson", "age": 30, "active": True, "email": "alice@example.com"},
-                {"_id": "user2", "name": "Bob Smith", "age": 25, "active": True, "email": "bob@example.com"},
-                {"_id": "user3", "name": "Charlie Brown", "age": 35, "active": False, "email": "charlie@example.com"},
-                {"_id": "user4", "name": "Diana Prince", "age": 28, "active": True, "email": "diana@example.com"},
-                {"_id": "user5", "name": "Eve Wilson", "age": 22, "active": False, "email": "eve@example.com"}
-            ],
-            "test_orders": [
-                {"_id": "order1", "user_id": "user1", "total": 100.50, "status": "completed", "items": 3},
-                {"_id": "order2", "user_id": "user2", "total": 75.25, "status": "pending", "items": 2},
-                {"_id": "order3", "user_id": "user1", "total": 200.00, "status": "completed", "items": 5},
-                {"_id": "order4", "user_id": "user3", "total": 50.75, "status": "cancelled", "items": 1},
-                {"_id": "order5", "user_id": "user4", "total": 150.00, "status": "completed", "items": 4}
-            ],
-            "test_products": [
-                {"_id": "prod1", "name": "Widget A", "price": 19.99, "category": "widgets", "in_stock": True},
-                {"_id": "prod2", "name": "Gadget B", "price": 29.99, "category": "gadgets", "in_stock": True},
-                {"_id": "prod3", "name": "Tool C", "price": 39.99, "category": "tools", "in_stock": False},
-                {"_id": "prod4", "name": "Device D", "price": 49.99, "category": "devices", "in_stock": True},
-                {"_id": "prod5", "name": "Component E", "price": 9.99, "category": "components", "in_stock": True}
-            ]
-        }
-        
-        # Insert data into collections
-        for collection_name, documents in collections_data.items():
-            collection = db[collection_name]
-            
-            # Clear existing data
-            collection.drop()
-            
-            # Insert new data
-            if documents:
-                collection.insert_many(documents)
-                print(f"✅ Initialized {collection_name} with {len(documents)} documents")
-            else:
-                print(f"⚠️ No data to insert for {collection_name}")
-        
-        # Create indexes for better performance
-        db.test_users.create_index("email", unique=True)
-        db.test_users.create_index("active")
-        db.test_orders.create_index("user_id")
-        db.test_orders.create_index("status")
-        db.test_products.create_index("category")
-        db.test_products.create_index("in_stock")
-        
-        print("✅ Created indexes for test collections")
-        
+
+        fingerprint = seed_fingerprint(scale)
+        if stored_fingerprint(db) == fingerprint:
+            print(f"✅ {database_name} already holds this seed data ({fingerprint[:12]}), skipping")
+            return
+
+        snapshot = snapshots.snapshot_path("mongodb", fingerprint)
+        restore = _mongo_tool("mongorestore", mongodb_uri, container)
+        started = time.perf_counter()
+        if (
+            snapshot.exists()
+            and restore
+            and snapshots.restore_snapshot([*restore, "--drop", f"--nsInclude={database_name}.*"], snapshot)
+            and stored_fingerprint(db) == fingerprint
+        ):
+            print(f"♻️ Restored {database_name} from {snapshot.name} in {time.perf_counter() - started:.2f}s")
+        else:
+            # Cleared first, so an interrupted seed never looks complete
+            db[SEED_METADATA_COLLECTION].drop()
+            seed_collections(db, scale, workers)
+            db[SEED_METADATA_COLLECTION].insert_one({"_id": "seed", "fingerprint": fingerprint, "scale": scale})
+
+            dump = _mongo_tool("mongodump", mongodb_uri, container)
+            if dump and snapshots.save_snapshot([*dump, f"--db={database_name}"], snapshot, "mongodb"):
+                print(f"💾 Saved seed snapshot {snapshot.name}")
+
         # Verify data insertion
-        for collection_name in collections_data.keys():
-            count = db[collection_name].count_documents({})
+        for collection_name in SAMPLE_DATA:
+            count = db[collection_name].estimated_document_count()
             print(f"📊 {collection_name}: {count} documents")
-        
+
         print(f"🎉 MongoDB test database '{database_name}' initialized successfully!")
-        
+
     except Exception as e:
         print(f"❌ Failed to initialize MongoDB test database: {e}")
         sys.exit(1)
@@ -89,5 +230,15 @@ def initialize_test_database():
 
 
 if __name__ == "__main__":
-    initialize_test_database()
-{%- endif -%}
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Initialize the MongoDB test database.")
+    synthetic.add_scale_argument(parser)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=LOAD_WORKERS,
+        help=f"concurrent insert batches (default: {LOAD_WORKERS})",
+    )
+    snapshots.add_container_argument(parser)
+    args = parser.parse_args()
+    initialize_test_database(scale=args.scale, workers=max(1, args.workers), container=args.container)
+{%- endif -%}
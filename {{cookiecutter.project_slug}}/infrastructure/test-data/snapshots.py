@@ -0,0 +1,85 @@
+{%- if cookiecutter.database_backend in ['mongodb', 'postgresql'] -%}
+"""
+Seed snapshot cache for the initialization scripts.
+Each seeded dataset is dumped to an archive named after its fingerprint;
+seeding the same data again restores the archive instead of regenerating.
+Dump tools run inside the test container when one is given, so their
+version always matches the server's, and otherwise from PATH.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SNAPSHOT_DIR = PROJECT_ROOT / ".cache" / "seed-snapshots"
+
+# Archives kept per backend; older ones are deleted when a new one is saved
+SNAPSHOTS_KEPT = 3
+
+
+def content_hash(payload: dict) -> str:
+    """Hash a JSON-serialisable description of a dataset."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def snapshot_path(backend: str, fingerprint: str) -> Path:
+    """Archive holding the dataset with ``fingerprint``."""
+    return SNAPSHOT_DIR / f"{backend}-{fingerprint[:16]}.archive"
+
+
+def tool_command(tool: str, container: str | None) -> list[str] | None:
+    """Command prefix running a dump tool, or None if it is not available."""
+    if container:
+        return ["docker", "exec", "-i", container, tool]
+    if shutil.which(tool):
+        return [tool]
+    return None
+
+
+def save_snapshot(cmd: list[str], path: Path, backend: str) -> bool:
+    """Write the dump that ``cmd`` prints to ``path`` and prune older archives."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("wb") as archive:
+        completed = subprocess.run(cmd, stdout=archive, stderr=subprocess.PIPE, check=False)
+    if completed.returncode != 0:
+        tmp_path.unlink(missing_ok=True)
+        print(f"⚠️ Could not save a seed snapshot: {completed.stderr.decode(errors='replace').strip()}")
+        return False
+    os.replace(tmp_path, path)
+
+    older = sorted(
+        (candidate for candidate in SNAPSHOT_DIR.glob(f"{backend}-*.archive") if candidate != path),
+        key=lambda candidate: candidate.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in older[SNAPSHOTS_KEPT - 1:]:
+        stale.unlink(missing_ok=True)
+    return True
+
+
+def restore_snapshot(cmd: list[str], path: Path) -> bool:
+    """Feed the archive at ``path`` to ``cmd`` and report whether it succeeded."""
+    with path.open("rb") as archive:
+        completed = subprocess.run(cmd, stdin=archive, stderr=subprocess.PIPE, check=False)
+    if completed.returncode != 0:
+        print(f"⚠️ Could not restore {path.name}: {completed.stderr.decode(errors='replace').strip()}")
+        return False
+    # Recently used archives survive pruning
+    path.touch()
+    return True
+
+
+def add_container_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the seed scripts' --container option."""
+    parser.add_argument(
+        "--container",
+        metavar="NAME",
+        help="run dump and restore tools in this docker container instead of from PATH",
+    )
+{% endif -%}
@@ -0,0 +1,142 @@
+{%- if cookiecutter.database_backend in ['mongodb', 'postgresql'] -%}
+"""
+Deterministic synthetic test data for load testing.
+Rows follow the schema of the seed scripts and are generated lazily in
+chunks, so any volume loads in constant memory. Each chunk is seeded on its
+own: the same scale always yields the same rows, in any chunk order.
+"""
+
+import argparse
+import random
+from collections.abc import Iterator
+
+# Rows generated (and inserted) per chunk
+CHUNK_SIZE = 10_000
+
+# Rows per unit of --scale: scale 1 is ~6k rows, scale 2000 ~12M
+ROWS_PER_SCALE = {
+    "test_users": 1_000,
+    "test_orders": 5_000,
+    "test_products": 100,
+}
+
+DEFAULT_SEED = 1729
+
+# Field order of generated rows; the first field is the primary key
+COLUMNS = {
+    "test_users": ("id", "name", "age", "active", "email"),
+    "test_orders": ("id", "user_id", "total", "status", "items"),
+    "test_products": ("id", "name", "price", "category", "in_stock"),
+}
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Heidi", "Ivan", "Judy",
+    "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent", "Victor", "Walter", "Zoe",
+]
+LAST_NAMES = [
+    "Johnson", "Smith", "Brown", "Prince", "Wilson", "Garcia", "Miller", "Davis", "Lopez", "Clark",
+    "Lewis", "Walker", "Young", "King", "Wright", "Scott", "Green", "Baker", "Adams", "Nelson",
+]
+ORDER_STATUSES = ("completed", "pending", "cancelled")
+ORDER_STATUS_WEIGHTS = (70, 20, 10)
+CATEGORIES = ("widgets", "gadgets", "tools", "devices", "components")
+CATEGORY_WEIGHTS = (35, 25, 20, 15, 5)
+
+# Order totals and prices stay within DECIMAL(10,2)
+MAX_AMOUNT = 99_999.99
+
+
+def table_size(table: str, scale: int) -> int:
+    """Number of rows ``table`` has at ``scale``."""
+    return ROWS_PER_SCALE[table] * scale
+
+
+def chunk_count(table: str, scale: int) -> int:
+    """Number of chunks ``table`` is generated in at ``scale``."""
+    return -(-table_size(table, scale) // CHUNK_SIZE)
+
+
+def generate_chunk(table: str, scale: int, index: int, seed: int = DEFAULT_SEED) -> list[tuple]:
+    """Rows ``index * CHUNK_SIZE`` onwards of ``table``, up to CHUNK_SIZE of them."""
+    rng = random.Random(f"{seed}:{table}:{index}")
+    start = index * CHUNK_SIZE
+    stop = min(start + CHUNK_SIZE, table_size(table, scale))
+    make_row = _ROW_FACTORIES[table]
+    return [make_row(number, rng, scale=scale) for number in range(start, stop)]
+
+
+def chunks(table: str, scale: int, seed: int = DEFAULT_SEED) -> Iterator[list[tuple]]:
+    """Yield every row of ``table`` at ``scale``, one chunk at a time."""
+    for index in range(chunk_count(table, scale)):
+        yield generate_chunk(table, scale, index, seed)
+
+
+def as_documents(table: str, rows: list[tuple]) -> list[dict]:
+    """Turn rows into MongoDB documents, keyed by ``_id``."""
+    fields = ("_id", *COLUMNS[table][1:])
+    return [dict(zip(fields, row, strict=True)) for row in rows]
+
+
+def _user(number: int, rng: random.Random, **_: int) -> tuple:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return (
+        f"user{number + 1}",
+        f"{first} {last}",
+        int(rng.triangular(18, 90, 32)),
+        rng.random() < 0.8,
+        # The number keeps emails unique
+        f"{first.lower()}.{last.lower()}.{number + 1}@example.com",
+    )
+
+
+def _order(number: int, rng: random.Random, scale: int) -> tuple:
+    # Skewed towards low user numbers: a few users place most orders
+    user_number = int(table_size("test_users", scale) * rng.random() ** 3)
+    return (
+        f"order{number + 1}",
+        f"user{user_number + 1}",
+        min(round(rng.lognormvariate(4, 0.8), 2), MAX_AMOUNT),
+        rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0],
+        1 + min(int(rng.expovariate(1 / 3)), 49),
+    )
+
+
+def _product(number: int, rng: random.Random, **_: int) -> tuple:
+    category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+    return (
+        f"prod{number + 1}",
+        f"{category[:-1].title()} {number + 1}",
+        min(round(rng.lognormvariate(3, 1), 2), MAX_AMOUNT),
+        category,
+        rng.random() < 0.9,
+    )
+
+
+_ROW_FACTORIES = {
+    "test_users": _user,
+    "test_orders": _order,
+    "test_products": _product,
+}
+
+
+def add_scale_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the seed scripts' --scale option."""
+
+    def non_negative(value: str) -> int:
+        scale = int(value)
+        if scale < 0:
+            raise argparse.ArgumentTypeError("must be 0 or more")
+        return scale
+
+    parser.add_argument(
+        "--scale",
+        type=non_negative,
+        default=0,
+        metavar="N",
+        help=(
+            "load synthetic data instead of the sample rows: "
+            + ", ".join(f"{rows:,} {table.removeprefix('test_')}" for table, rows in ROWS_PER_SCALE.items())
+            + " per unit of N"
+        ),
+    )
+{% endif -%}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Asyncio counterparts of the command runners in utils.py.
+Lets scripts (and the project's own tooling) fan out commands on one event
+loop instead of a thread per command.
+"""
+
+import asyncio
+import codecs
+import os
+import time
+
+import typer
+from utils import (
+    DEFAULT_TAIL_BYTES,
+    PROJECT_ROOT,
+    CommandResult,
+    OutputTail,
+    console,
+    print_failure,
+    record_usage,
+    usage_snapshot,
+)
+
+# Size of each read from a child's pipe
+_READ_CHUNK = 64 * 1024
+
+
+class _Span:
+    """A running command, flagged once another command overlaps it."""
+
+    __slots__ = ("overlapped",)
+
+    def __init__(self, overlapped: bool):
+        self.overlapped = overlapped
+
+
+# Commands currently running. Usage is measured as growth of the children
+# totals, so a command that overlapped another may be charged some of its
+# CPU time; its figures are recorded as approximate.
+_IN_FLIGHT: set[_Span] = set()
+
+
+class _CommandFailed(Exception):
+    """Raised inside a task group to cancel the remaining commands."""
+
+
+async def _drain(stream: asyncio.StreamReader, tail: OutputTail) -> None:
+    """Feed a child's pipe into a tail buffer until EOF."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while chunk := await stream.read(_READ_CHUNK):
+        text = decoder.decode(chunk)
+        if text:
+            tail.append(text)
+    text = decoder.decode(b"", final=True)
+    if text:
+        tail.append(text)
+
+
+async def run_command_async(cmd: list[str], capture_output: bool = False, check: bool = True,
+                            tail_bytes: int | None = None) -> CommandResult:
+    """Run a command on the event loop with the same contract as ``run_command``.
+
+    Cancelling the awaiting task kills the child before the cancellation
+    propagates, so no process outlives its caller.
+
+    Args:
+        cmd: Command and arguments as list
+        capture_output: Whether to capture stdout/stderr
+        check: Whether to raise on non-zero exit code
+        tail_bytes: Capture in bounded mode, keeping only the last N bytes
+            of each stream (implies capture_output)
+
+    Returns:
+        CommandResult with returncode, stdout, stderr and resource usage
+
+    Raises:
+        typer.Exit: If check=True and command fails
+    """
+    captured = capture_output or tail_bytes is not None
+    pipe = asyncio.subprocess.PIPE if captured else None
+    started = time.perf_counter()
+    before = usage_snapshot()
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=pipe, stderr=pipe, cwd=PROJECT_ROOT
+        )
+    except OSError as e:
+        console.print(f"[red]❌ Unexpected error running command: {e}[/red]")
+        if check:
+            raise typer.Exit(1) from e
+        return CommandResult(returncode=1, stderr=str(e), command=cmd)
+
+    span = _Span(overlapped=bool(_IN_FLIGHT))
+    for other in _IN_FLIGHT:
+        other.overlapped = True
+    _IN_FLIGHT.add(span)
+
+    stdout_tail = OutputTail(tail_bytes)
+    stderr_tail = OutputTail(tail_bytes)
+    try:
+        if captured:
+            assert process.stdout is not None and process.stderr is not None
+            await asyncio.gather(
+                _drain(process.stdout, stdout_tail),
+                _drain(process.stderr, stderr_tail),
+            )
+        returncode = await process.wait()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+        record_usage(CommandResult(await process.wait()), cmd, started, before,
+                     approximate=span.overlapped)
+        raise
+    finally:
+        _IN_FLIGHT.discard(span)
+
+    result = record_usage(
+        CommandResult(
+            returncode=returncode,
+            stdout=stdout_tail.getvalue(),
+            stderr=stderr_tail.getvalue(),
+            stdout_dropped=stdout_tail.dropped,
+            stderr_dropped=stderr_tail.dropped,
+        ),
+        cmd,
+        started,
+        before,
+        approximate=span.overlapped,
+    )
+
+    if check and not result.success:
+        print_failure(cmd, result)
+        raise typer.Exit(1)
+
+    return result
+
+
+async def gather_commands(commands: dict[str, list[str]], limit: int | None = None,
+                          fail_fast: bool = True,
+                          tail_bytes: int | None = DEFAULT_TAIL_BYTES) -> dict[str, CommandResult]:
+    """Run independent commands concurrently, at most ``limit`` at a time.
+
+    With ``fail_fast`` the first failing command cancels everything still
+    queued or running; cancelled commands are left out of the result.
+
+    Args:
+        commands: Mapping of name to command and arguments
+        limit: Upper bound on concurrent commands (defaults to CPU count)
+        fail_fast: Whether the first failure cancels the remaining commands
+        tail_bytes: Bytes of each command's output to keep (None keeps all)
+
+    Returns:
+        Mapping of name to CommandResult, in the order given
+    """
+    if not commands:
+        return {}
+
+    semaphore = asyncio.Semaphore(max(1, limit or os.cpu_count() or 1))
+    results: dict[str, CommandResult] = {}
+
+    async def run_one(name: str, cmd: list[str]) -> None:
+        async with semaphore:
+            result = await run_command_async(
+                cmd, capture_output=True, check=False, tail_bytes=tail_bytes
+            )
+        results[name] = result
+        if fail_fast and not result.success:
+            raise _CommandFailed(name)
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for name, cmd in commands.items():
+                group.create_task(run_one(name, cmd))
+    except* _CommandFailed:
+        pass
+
+    return {name: results[name] for name in commands if name in results}
@@ -14,12 +14,14 @@ from rich.panel import Panel
 from rich.status import Status
 from rich.table import Table
 
-from utils import run_command
+from utils import run_command, profile_option
+from cache import run_cached
 
 app = typer.Typer(
     name="build",
     help="Build and Distribution Management Script",
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
@@ -89,7 +91,9 @@ def upload(
 
 
 @app.command()
-def check() -> None:
+def check(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run twine instead of replaying a cached result"),
+) -> None:
     """Check package for common issues."""
     if not DIST_DIR.exists() or not list(DIST_DIR.glob("*")):
         console.print("[red]❌ No built packages found. Run 'pixi run build package' first.[/red]")
@@ -99,7 +103,7 @@ def check() -> None:
     console.print(panel)
     
     with Status("Checking package...", console=console, spinner="dots"):
-        run_command(["twine", "check", str(DIST_DIR / "*")])
+        run_cached(["twine", "check", str(DIST_DIR / "*")], [DIST_DIR], use_cache=not no_cache)
     
     console.print("[green]✅ Package check completed![/green]")
 
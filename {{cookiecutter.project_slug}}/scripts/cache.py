@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Content-addressed result cache for pure tool invocations.
+Replays the exit code and output of checks like mypy, ruff and twine when
+neither the command, the tool version nor any input file has changed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import typer
+from utils import (
+    DEFAULT_TAIL_BYTES,
+    PROJECT_ROOT,
+    CommandResult,
+    print_failure,
+    run_command,
+    run_parallel,
+)
+
+CACHE_DIR = PROJECT_ROOT / ".cache" / "tool-results"
+
+# Total size of stored results before the least recently used are evicted
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Configuration files that change what every tool reports
+CONFIG_FILES = ["pyproject.toml", "ruff.toml", ".ruff.toml", "mypy.ini", "setup.cfg"]
+
+_VERSIONS_FILE = "versions.json"
+
+# CommandResult fields needed to replay a run
+_STORED_FIELDS = ("returncode", "stdout", "stderr", "stdout_dropped", "stderr_dropped", "command")
+
+
+class ResultCache:
+    """Stored command results addressed by a hash of everything they depend on.
+
+    Each entry is a small JSON file; reading one refreshes its mtime, which
+    is what least-recently-used eviction goes by.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._versions: dict[str, str] | None = None
+
+    def key(self, cmd: list[str], inputs_digest: str) -> str | None:
+        """Hash the command line, tool version and input digest.
+
+        Returns None when the tool is not installed, so nothing is cached.
+        """
+        version = self.tool_version(cmd[0])
+        if version is None:
+            return None
+
+        payload = json.dumps({"cmd": cmd, "version": version, "inputs": inputs_digest})
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def tool_version(self, command_name: str) -> str | None:
+        """Return ``<tool> --version`` output, re-run only when the executable changes."""
+        executable = shutil.which(command_name)
+        if executable is None:
+            return None
+
+        stat = os.stat(executable)
+        fingerprint = f"{os.path.realpath(executable)}:{stat.st_mtime_ns}:{stat.st_size}"
+        versions = self._load_versions()
+        if fingerprint not in versions:
+            result = run_command([command_name, "--version"], capture_output=True, check=False)
+            if not result.success:
+                return None
+            versions[fingerprint] = result.stdout.strip()
+            self._write_json(self.cache_dir / _VERSIONS_FILE, versions)
+        return versions[fingerprint]
+
+    def get(self, key: str) -> CommandResult | None:
+        """Return the stored result for ``key``, if any."""
+        entry = self.cache_dir / f"{key}.json"
+        try:
+            data = json.loads(entry.read_text())
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+
+        return CommandResult(**data, cached=True)
+
+    def put(self, key: str, result: CommandResult) -> None:
+        """Store a result, then evict old entries past the size bound."""
+        entry = {field: getattr(result, field) for field in _STORED_FIELDS}
+        self._write_json(self.cache_dir / f"{key}.json", entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        for entry in self.cache_dir.glob("*.json"):
+            if entry.name == _VERSIONS_FILE:
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def _load_versions(self) -> dict[str, str]:
+        if self._versions is None:
+            try:
+                self._versions = json.loads((self.cache_dir / _VERSIONS_FILE).read_text())
+            except (OSError, ValueError):
+                self._versions = {}
+        return self._versions
+
+    def _write_json(self, path: Path, data: object) -> None:
+        """Write atomically so concurrent runs never see a partial entry."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp_path, path)
+
+
+def digest_inputs(inputs: list[Path]) -> str:
+    """Hash the paths and contents of every input file."""
+    root = PROJECT_ROOT.resolve()
+    digest = hashlib.sha256()
+    for path in _input_files(inputs):
+        # Files outside the project (absolute or symlinked inputs) keep their absolute path
+        name = path.relative_to(root) if path.is_relative_to(root) else path
+        digest.update(str(name).encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _input_files(inputs: list[Path]) -> list[Path]:
+    """Expand input paths (plus tool configuration) into a sorted file list.
+
+    Relative inputs are taken relative to the project root.
+    """
+    files: set[Path] = set()
+    for name in [*inputs, *map(Path, CONFIG_FILES)]:
+        path = (PROJECT_ROOT / name).resolve()
+        if path.is_file():
+            files.add(path)
+        elif path.is_dir():
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+                files.update(Path(root) / name for name in names if not name.endswith(".pyc"))
+    return sorted(files)
+
+
+def _cacheable(result: CommandResult) -> bool:
+    """Only replay results the tool produced itself, not crashes or kills."""
+    return result.signal is None and bool(result.command)
+
+
+def run_cached(cmd: list[str], inputs: list[Path], use_cache: bool = True,
+               check: bool = True, tail_bytes: int = DEFAULT_TAIL_BYTES) -> CommandResult:
+    """Run a pure tool through the result cache.
+
+    Output is always captured (bounded to ``tail_bytes`` per stream) so a
+    hit can replay it exactly.
+
+    Args:
+        cmd: Command and arguments as list
+        inputs: Files and directories whose contents the result depends on
+        use_cache: Whether to consult and update the cache
+        check: Whether to raise on non-zero exit code
+        tail_bytes: Bytes of each stream to keep
+
+    Returns:
+        CommandResult, with ``cached`` set when it was replayed
+
+    Raises:
+        typer.Exit: If check=True and command fails
+    """
+    cache = ResultCache()
+    key = cache.key(cmd, digest_inputs(inputs)) if use_cache else None
+    result = cache.get(key) if key else None
+
+    if result is None:
+        result = run_command(cmd, check=False, tail_bytes=tail_bytes)
+        if key and _cacheable(result):
+            cache.put(key, result)
+
+    if check and not result.success:
+        print_failure(cmd, result)
+        raise typer.Exit(1)
+
+    return result
+
+
+def run_parallel_cached(commands: dict[str, list[str]], inputs: list[Path],
+                        use_cache: bool = True, max_workers: int | None = None,
+                        tail_bytes: int = DEFAULT_TAIL_BYTES) -> dict[str, CommandResult]:
+    """Like ``run_parallel``, but only the commands without a cached result run.
+
+    Args:
+        commands: Mapping of check name to command and arguments
+        inputs: Files and directories the results depend on
+        use_cache: Whether to consult and update the cache
+        max_workers: Upper bound on concurrent commands (defaults to CPU count)
+        tail_bytes: Bytes of each command's output to keep
+
+    Returns:
+        Mapping of check name to CommandResult, in the order given
+    """
+    cache = ResultCache()
+    inputs_digest = digest_inputs(inputs) if use_cache else ""
+    keys = {
+        name: cache.key(cmd, inputs_digest) if use_cache else None
+        for name, cmd in commands.items()
+    }
+
+    results: dict[str, CommandResult] = {}
+    for name, key in keys.items():
+        hit = cache.get(key) if key else None
+        if hit is not None:
+            results[name] = hit
+
+    misses = {name: cmd for name, cmd in commands.items() if name not in results}
+    for name, result in run_parallel(misses, max_workers=max_workers, tail_bytes=tail_bytes).items():
+        key = keys[name]
+        if key and _cacheable(result):
+            cache.put(key, result)
+        results[name] = result
+
+    return {name: results[name] for name in commands}
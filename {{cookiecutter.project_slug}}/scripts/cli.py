@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Single entry point for all project scripts.
+Mounts each script's Typer app as a subcommand, importing the script module
+only when its subcommand runs. Composite tasks go through the task graph
+in tasks.py.
+"""
+
+import importlib
+from pathlib import Path
+from typing import Any
+
+import typer
+from tasks import run_pipeline
+from typer.core import TyperCommand, TyperGroup
+from utils import profile_option
+
+# Configuration
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Subcommand name -> script module providing its Typer ``app``
+SUBCOMMANDS = {
+    "quality": "quality",
+    "test": "test",
+    "build": "build",
+    "docs": "docs",
+    "dev": "dev",
+}
+
+
+def load_command(name: str) -> TyperCommand | TyperGroup:
+    """Import a script module and return its app as a typer command."""
+    module = importlib.import_module(SUBCOMMANDS[name])
+    command = typer.main.get_command(module.app)
+    if not isinstance(command, TyperCommand | TyperGroup):
+        raise TypeError(f"scripts/{SUBCOMMANDS[name]}.py: app is not a Typer app")
+    command.name = name
+    return command
+
+
+def run_in_process(name: str, args: list[str]) -> int:
+    """Run a subcommand in this interpreter and return its exit code."""
+    command = load_command(name)
+    exit_code = command.main(args, prog_name=name, standalone_mode=False)
+    return exit_code if isinstance(exit_code, int) else 0
+
+
+class LazyGroup(TyperGroup):
+    """Typer group whose script subcommands are imported on first use.
+
+    typer vendors click, so its context type has no public name; contexts
+    are taken as ``Any``.
+    """
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return [*SUBCOMMANDS, *super().list_commands(ctx)]
+
+    def get_command(self, ctx: Any, cmd_name: str) -> TyperCommand | TyperGroup | None:
+        if cmd_name in SUBCOMMANDS:
+            return load_command(cmd_name)
+        command = super().get_command(ctx, cmd_name)
+        # Commands registered on the app itself are TyperCommands
+        return command if isinstance(command, TyperCommand | TyperGroup) else None
+
+
+app = typer.Typer(
+    name="cli",
+    help="Project Scripts (quality, test, build, docs, dev)",
+    add_completion=False,
+    callback=profile_option,
+    cls=LazyGroup,
+)
+
+
+@app.command()
+def clean() -> None:
+    """Clean all project artifacts (test, docs, build, dev)."""
+    if not run_pipeline("clean"):
+        raise typer.Exit(1)
+
+
+@app.command("check-all")
+def check_all(
+    force: bool = typer.Option(False, "--force", help="Run every task even if its inputs are unchanged"),
+    jobs: int | None = typer.Option(None, "--jobs", "-j", help="Maximum concurrent tasks (default: CPU count)"),
+) -> None:
+    """Run comprehensive checks (all tests + quality)."""
+    if not run_pipeline("check-all", force=force, max_workers=jobs):
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    import os
+    os.chdir(PROJECT_ROOT)
+    app()
@@ -14,12 +14,13 @@ from rich.panel import Panel
 from rich.status import Status
 from rich.table import Table
 
-from utils import run_command
+from utils import run_command, run_batch, profile_option
 
 app = typer.Typer(
     name="dev",
     help="Development Environment Management Script",
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
@@ -92,19 +93,24 @@ def status() -> None:
     else:
         table.add_row("Python", "⚠️ Version", f"v{python_version} (expected 3.12+)")
     
+    # Probe tool versions in one batch so each executable is resolved once;
+    # pre-commit is only probed when the project configures it
+    probes = [["pixi", "--version"]]
+    if PRECOMMIT_CONFIG.exists():
+        probes.append(["pre-commit", "--version"])
+    pixi_probe, *precommit_probes = run_batch(probes, capture_output=True, check=False)
+    
     # Check pixi
-    try:
-        result = run_command(["pixi", "--version"], capture_output=True)
-        pixi_version = result.stdout.strip()
+    if pixi_probe.success:
+        pixi_version = pixi_probe.stdout.strip()
         table.add_row("Pixi", "✅ Available", pixi_version)
-    except:
+    else:
         table.add_row("Pixi", "❌ Missing", "Install pixi package manager")
     
     # Check pre-commit
-    if PRECOMMIT_CONFIG.exists():
-        try:
-            result = run_command(["pre-commit", "--version"], capture_output=True)
-            precommit_version = result.stdout.strip().split()[-1]
+    if precommit_probes:
+        if precommit_probes[0].success:
+            precommit_version = precommit_probes[0].stdout.strip().split()[-1]
             
             # Check if hooks are installed
             try:
@@ -112,7 +118,7 @@ def status() -> None:
                 table.add_row("Pre-commit", "✅ Ready", f"v{precommit_version}, hooks installed")
             except:
                 table.add_row("Pre-commit", "⚠️ Setup Needed", f"v{precommit_version}, run 'pixi run dev setup'")
-        except:
+        else:
             table.add_row("Pre-commit", "❌ Missing", "Install pre-commit")
     else:
         table.add_row("Pre-commit", "⚠️ No Config", "No .pre-commit-config.yaml found")
@@ -214,6 +220,13 @@ def clean() -> None:
         shutil.rmtree(ruff_cache)
         artifacts_cleaned.append("Ruff cache")
     
+    # Clean cached tool results
+    tool_results = PROJECT_ROOT / ".cache" / "tool-results"
+    if tool_results.exists():
+        import shutil
+        shutil.rmtree(tool_results)
+        artifacts_cleaned.append("Tool result cache")
+    
     # Clean any .DS_Store files (macOS)
     ds_store_files = list(PROJECT_ROOT.rglob(".DS_Store"))
     for ds_file in ds_store_files:
@@ -13,12 +13,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
 
-from utils import run_command
+from utils import run_command, profile_option
 
 app = typer.Typer(
     name="docs",
     help="Documentation Management Script", 
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Test impact analysis.
+Maps each test to the package source lines it executes, using per-test
+coverage contexts from earlier runs, and selects the tests affected by the
+changes since a git ref.
+"""
+
+import bisect
+import difflib
+import json
+import os
+import re
+from pathlib import Path
+
+from utils import PROJECT_ROOT, run_command
+
+IMPACT_DIR = PROJECT_ROOT / ".cache" / "test-impact"
+MAP_PATH = IMPACT_DIR / "map.json"
+
+# Copy of each mapped source file as of its recorded line numbers
+SNAPSHOT_DIR = IMPACT_DIR / "sources"
+
+PACKAGE_DIR = "{{ cookiecutter.package_name }}"
+TESTS_DIR = "tests"
+
+# Changes here may alter any test's behaviour
+GLOBAL_FILES = {"pyproject.toml", "pixi.toml", "setup.cfg", "tests/conftest.py"}
+
+# Coverage context of lines run outside any test, e.g. module bodies at import
+IMPORT_CONTEXT = ""
+
+_MAP_VERSION = 1
+
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class ImpactMap:
+    """Which lines of each package file every test executes.
+
+    ``files`` maps a project-relative path to ``{node id: [line numbers]}``;
+    line numbers refer to the file's snapshot, which is refreshed together
+    with the map so the two never disagree.
+    """
+
+    def __init__(self, files: dict[str, dict[str, list[int]]] | None = None):
+        self.files = files or {}
+
+    @classmethod
+    def load(cls) -> "ImpactMap | None":
+        """Return the recorded map, or None if there is none usable."""
+        try:
+            data = json.loads(MAP_PATH.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != _MAP_VERSION:
+            return None
+        return cls(data["files"])
+
+    def save(self) -> None:
+        MAP_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = MAP_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"version": _MAP_VERSION, "files": self.files}))
+        os.replace(tmp_path, MAP_PATH)
+
+    def select(self, changes: dict[str, set[int] | None]) -> set[str] | None:
+        """Return node ids and test files affected by ``changes``.
+
+        Returns None when the map cannot tell, and every test has to run:
+        shared configuration or test support code changed, or a changed
+        package file has not been mapped yet.
+        """
+        selected: set[str] = set()
+        for path, lines in changes.items():
+            if path in GLOBAL_FILES:
+                return None
+            if path.startswith(f"{TESTS_DIR}/"):
+                if not Path(path).name.startswith("test_") or not path.endswith(".py"):
+                    return None
+                if (PROJECT_ROOT / path).exists():
+                    selected.add(path)
+                continue
+            if not path.startswith(f"{PACKAGE_DIR}/"):
+                continue
+            if path not in self.files or not path.endswith(".py"):
+                return None
+            selected |= self._tests_touching(path, lines)
+        return selected
+
+    def _tests_touching(self, path: str, lines: set[int] | None) -> set[str]:
+        """Tests executing any of ``lines`` (current numbering) of ``path``."""
+        tests = self.files[path]
+        everyone = {nodeid for nodeid in tests if nodeid != IMPORT_CONTEXT}
+        snapshot = _read_snapshot(path)
+        source_path = PROJECT_ROOT / path
+        if lines is None or snapshot is None or not source_path.is_file():
+            return everyone
+
+        changed, nearby = _snapshot_lines(snapshot, source_path.read_text(), lines)
+        if changed.intersection(tests.get(IMPORT_CONTEXT, ())):
+            # Module-level code changed, so every user of the module may be affected
+            return everyone
+        hit = changed | nearby
+        return {nodeid for nodeid in everyone if hit.intersection(tests[nodeid])}
+
+    def update(self, data_file: Path, ran: set[str], full: bool = False) -> None:
+        """Fold a run's coverage contexts into the map and save it.
+
+        Entries of the tests that ran are replaced; those of the other tests
+        are carried over to each file's current line numbers. A full run
+        rebuilds the map, dropping tests that no longer exist.
+        """
+        fresh = _read_contexts(data_file)
+        ran = ran | ({nodeid for per_test in fresh.values() for nodeid in per_test} - {IMPORT_CONTEXT})
+        root = PROJECT_ROOT.resolve()
+
+        if full:
+            self.files = {}
+            paths = {path.relative_to(root).as_posix() for path in (root / PACKAGE_DIR).rglob("*.py")}
+        else:
+            paths = set(self.files)
+        paths |= set(fresh)
+
+        for path in sorted(paths):
+            source_path = PROJECT_ROOT / path
+            if not source_path.is_file():
+                self.files.pop(path, None)
+                (SNAPSHOT_DIR / path).unlink(missing_ok=True)
+                continue
+
+            current = source_path.read_text()
+            snapshot = _read_snapshot(path)
+            tests = self.files.get(path, {}) if snapshot is not None else {}
+            if snapshot is not None and snapshot != current:
+                shift = _line_map(snapshot, current)
+                tests = {
+                    nodeid: [shift[line] for line in lines if line in shift]
+                    for nodeid, lines in tests.items()
+                }
+
+            replaced = ran | ({IMPORT_CONTEXT} if path in fresh else set())
+            tests = {nodeid: lines for nodeid, lines in tests.items() if nodeid not in replaced and lines}
+            for nodeid, lines in fresh.get(path, {}).items():
+                tests[nodeid] = sorted(lines)
+            self.files[path] = tests
+
+            if snapshot != current:
+                (SNAPSHOT_DIR / path).parent.mkdir(parents=True, exist_ok=True)
+                (SNAPSHOT_DIR / path).write_text(current)
+
+        self.save()
+
+
+def _read_snapshot(path: str) -> str | None:
+    try:
+        return (SNAPSHOT_DIR / path).read_text()
+    except OSError:
+        return None
+
+
+def _snapshot_lines(snapshot: str, current: str, lines: set[int]) -> tuple[set[int], set[int]]:
+    """Translate changed lines of ``current`` into lines of ``snapshot``.
+
+    Returns the snapshot lines the changed lines correspond to or replace,
+    and, for lines inserted since the snapshot, the snapshot lines on either
+    side of the insertion.
+    """
+    ordered = sorted(lines)
+
+    def touches(first: int, last: int) -> bool:
+        index = bisect.bisect_left(ordered, first)
+        return index < len(ordered) and ordered[index] <= last
+
+    changed: set[int] = set()
+    nearby: set[int] = set()
+    matcher = difflib.SequenceMatcher(None, snapshot.splitlines(), current.splitlines(), autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            changed.update(i1 + line - j1 for line in ordered if j1 < line <= j2)
+        elif tag == "insert" and touches(j1 + 1, j2):
+            nearby.update((i1, i1 + 1))
+        elif tag == "replace" and touches(j1 + 1, j2):
+            changed.update(range(i1 + 1, i2 + 1))
+        elif tag == "delete" and touches(j1, j1 + 1):
+            # Lines removed since the snapshot, between current lines j1 and j1 + 1
+            changed.update(range(i1 + 1, i2 + 1))
+    return changed, nearby
+
+
+def _line_map(old: str, new: str) -> dict[int, int]:
+    """Map 1-based line numbers of ``old`` to ``new`` for unchanged lines."""
+    matcher = difflib.SequenceMatcher(None, old.splitlines(), new.splitlines(), autojunk=False)
+    mapping: dict[int, int] = {}
+    for tag, i1, i2, j1, _ in matcher.get_opcodes():
+        if tag == "equal":
+            mapping.update((i1 + offset + 1, j1 + offset + 1) for offset in range(i2 - i1))
+    return mapping
+
+
+def _read_contexts(data_file: Path) -> dict[str, dict[str, set[int]]]:
+    """Read ``{path: {node id: lines}}`` for package files from a coverage data file."""
+    if not data_file.exists():
+        return {}
+
+    # Imported here so the other test commands work without coverage installed
+    from coverage import CoverageData
+
+    data = CoverageData(basename=str(data_file))
+    data.read()
+    root = PROJECT_ROOT.resolve()
+    contexts: dict[str, dict[str, set[int]]] = {}
+    for measured in data.measured_files():
+        try:
+            path = Path(measured).resolve().relative_to(root).as_posix()
+        except ValueError:
+            continue
+        if not path.startswith(f"{PACKAGE_DIR}/"):
+            continue
+        per_test = contexts.setdefault(path, {})
+        for line, names in data.contexts_by_lineno(measured).items():
+            for name in names:
+                # pytest-cov names contexts "<node id>|setup", "|run" or "|teardown"
+                per_test.setdefault(name.split("|")[0], set()).add(line)
+    return contexts
+
+
+def changed_lines(ref: str) -> dict[str, set[int] | None] | None:
+    """Map each file changed since ``ref``, committed or not, to its changed lines.
+
+    Lines are numbered as in the working tree; None stands for the whole
+    file (untracked, deleted or renamed away). Returns None when git cannot
+    diff against ``ref``.
+    """
+    diff = run_command(
+        ["git", "--no-pager", "diff", "-U0", "--no-color", "--no-ext-diff", "--relative", ref, "--"],
+        capture_output=True,
+        check=False,
+    )
+    if not diff.success:
+        return None
+
+    changes: dict[str, set[int] | None] = {}
+    old_path = None
+    current = None
+    for line in diff.stdout.splitlines():
+        if line.startswith("--- "):
+            old_path = None if line == "--- /dev/null" else line[4:].removeprefix("a/")
+        elif line.startswith("+++ "):
+            current = None if line == "+++ /dev/null" else line[4:].removeprefix("b/")
+            if old_path is not None and old_path != current:
+                changes[old_path] = None
+            if current is not None:
+                changes.setdefault(current, set())
+        elif current is not None and (match := _HUNK_RE.match(line)):
+            lines = changes[current]
+            if lines is None:
+                continue
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            if count == 0:
+                # Pure deletion after line ``start``: the lines on either side
+                lines.update((start, start + 1))
+            else:
+                lines.update(range(start, start + count))
+
+    untracked = run_command(
+        ["git", "--no-pager", "ls-files", "--others", "--exclude-standard"],
+        capture_output=True,
+        check=False,
+    )
+    for path in untracked.stdout.splitlines():
+        changes[path] = None
+    return changes
@@ -4,22 +4,25 @@ Code quality management script with mypy, ruff, and coverage support.
 Unified interface for all code quality tasks.
 """
 
+import re
 import sys
+import tomllib
 from pathlib import Path
-from typing import Optional
+from typing import TypedDict
 
 import typer
+from cache import run_cached, run_parallel_cached
 from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
 from rich.table import Table
-
-from utils import run_command
+from utils import profile_option, run_command
 
 app = typer.Typer(
     name="quality",
     help="Code Quality Management Script",
     add_completion=False,
+    callback=profile_option,
 )
 console = Console()
 
@@ -28,54 +31,77 @@ PROJECT_ROOT = Path(__file__).parent.parent
 PACKAGE_PATH = PROJECT_ROOT / "{{ cookiecutter.package_name }}"
 TESTS_PATH = PROJECT_ROOT / "tests"
 
+# Files the read-only checks depend on; unchanged inputs replay cached results
+CHECK_INPUTS = [PACKAGE_PATH, TESTS_PATH]
+
+# Independent checks run by `check`: name -> (table label, command)
+CHECKS = {
+    "typecheck": ("Type Check", ["mypy", "{{ cookiecutter.package_name }}"]),
+    "lint": ("Linting", ["ruff", "check", "{{ cookiecutter.package_name }}", "tests"]),
+    "format": ("Formatting", ["ruff", "format", "--check", "{{ cookiecutter.package_name }}", "tests"]),
+}
+
+# Import-time budgets in milliseconds, overridden by [tool.importtime] in pyproject.toml
+IMPORTTIME_DEFAULTS = {"total_ms": 100.0, "submodule_ms": 50.0}
+
+# One line of `python -X importtime` output: self us | cumulative us | indented name
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
 
 
+class ImportTimeBudget(TypedDict):
+    """Import-time limits in milliseconds."""
+
+    total_ms: float
+    submodule_ms: float
+    # Per-module overrides of submodule_ms
+    submodules: dict[str, float]
+
 
 @app.command()
-def check() -> None:
+def check(
+    jobs: int | None = typer.Option(None, "--jobs", "-j", help="Maximum concurrent checks (default: CPU count)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run every check instead of replaying cached results"),
+) -> None:
     """Run all quality checks (typecheck + lint + format check)."""
     panel = Panel.fit("🔍 Running All Code Quality Checks", style="blue")
     console.print(panel)
     
-    results = {}
-    
-    # Type checking
-    with Status("Running mypy type checking...", console=console, spinner="dots"):
-        try:
-            run_command(["mypy", "{{ cookiecutter.package_name }}"])
-            results["typecheck"] = "✅ Pass"
-        except typer.Exit:
-            results["typecheck"] = "❌ Fail"
-    
-    # Linting
-    with Status("Running ruff linting...", console=console, spinner="dots"):
-        try:
-            run_command(["ruff", "check", "{{ cookiecutter.package_name }}", "tests"])
-            results["lint"] = "✅ Pass"
-        except typer.Exit:
-            results["lint"] = "❌ Fail"
-    
-    # Format checking
-    with Status("Checking code formatting...", console=console, spinner="dots"):
-        try:
-            run_command(["ruff", "format", "--check", "{{ cookiecutter.package_name }}", "tests"])
-            results["format"] = "✅ Pass"
-        except typer.Exit:
-            results["format"] = "❌ Fail"
+    # The checks are independent, so run them side by side
+    with Status("Running quality checks...", console=console, spinner="dots"):
+        outcomes = run_parallel_cached(
+            {name: cmd for name, (_, cmd) in CHECKS.items()},
+            CHECK_INPUTS,
+            use_cache=not no_cache,
+            max_workers=jobs,
+        )
+    
+    # Show output from any failing tool, one block per check
+    for name, outcome in outcomes.items():
+        if not outcome.success:
+            label, cmd = CHECKS[name]
+            console.print(f"[red]❌ {label} failed: {' '.join(cmd)}[/red]")
+            if outcome.truncated:
+                dropped = outcome.stdout_dropped + outcome.stderr_dropped
+                console.print(f"[yellow]… {dropped} bytes of earlier output dropped[/yellow]")
+            if outcome.stdout:
+                console.print(outcome.stdout.rstrip(), markup=False)
+            if outcome.stderr:
+                console.print(outcome.stderr.rstrip(), markup=False)
     
     # Results table
     table = Table(title="Quality Check Results", show_header=True, header_style="bold magenta")
     table.add_column("Check", style="cyan")
     table.add_column("Result", justify="center")
     
-    table.add_row("Type Check", results["typecheck"])
-    table.add_row("Linting", results["lint"])
-    table.add_row("Formatting", results["format"])
+    for name, outcome in outcomes.items():
+        label, _ = CHECKS[name]
+        status = "✅ Pass" if outcome.success else "❌ Fail"
+        table.add_row(label, f"{status} (cached)" if outcome.cached else status)
     
     console.print(table)
     
     # Exit with error if any check failed
-    if "❌ Fail" in results.values():
+    if not all(outcome.success for outcome in outcomes.values()):
         console.print("\n[red]❌ Some quality checks failed[/red]")
         raise typer.Exit(1)
     else:
@@ -83,27 +109,34 @@ def check() -> None:
 
 
 @app.command()
-def typecheck() -> None:
+def typecheck(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run instead of replaying a cached result"),
+) -> None:
     """Run mypy type checking."""
     console.print("🔍 Running mypy type checking...")
-    run_command(["mypy", "{{ cookiecutter.package_name }}"])
+    run_cached(CHECKS["typecheck"][1], CHECK_INPUTS, use_cache=not no_cache)
     console.print("[green]✅ Type checking passed![/green]")
 
 
 @app.command()
-def lint() -> None:
+def lint(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run instead of replaying a cached result"),
+) -> None:
     """Run ruff linting (check only)."""
     console.print("🔍 Running ruff linting...")
-    run_command(["ruff", "check", "{{ cookiecutter.package_name }}", "tests"])
+    run_cached(CHECKS["lint"][1], CHECK_INPUTS, use_cache=not no_cache)
     console.print("[green]✅ Linting passed![/green]")
 
 
 @app.command()
-def format(check_only: bool = typer.Option(False, "--check", help="Check formatting without making changes")) -> None:
+def format(
+    check_only: bool = typer.Option(False, "--check", help="Check formatting without making changes"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-run --check instead of replaying a cached result"),
+) -> None:
     """Format code with ruff (or check formatting)."""
     if check_only:
         console.print("🔍 Checking code formatting...")
-        run_command(["ruff", "format", "--check", "{{ cookiecutter.package_name }}", "tests"])
+        run_cached(CHECKS["format"][1], CHECK_INPUTS, use_cache=not no_cache)
         console.print("[green]✅ Code formatting is correct![/green]")
     else:
         console.print("🎨 Formatting code with ruff...")
@@ -128,6 +161,108 @@ def fix() -> None:
     console.print("[yellow]💡 Run 'pixi run quality check' to verify all issues are resolved[/yellow]")
 
 
+def load_importtime_budget() -> ImportTimeBudget:
+    """Read import-time budgets from pyproject.toml, filling in defaults."""
+    with open(PROJECT_ROOT / "pyproject.toml", "rb") as f:
+        config = tomllib.load(f).get("tool", {}).get("importtime", {})
+    return ImportTimeBudget(
+        total_ms=float(config.get("total_ms", IMPORTTIME_DEFAULTS["total_ms"])),
+        submodule_ms=float(config.get("submodule_ms", IMPORTTIME_DEFAULTS["submodule_ms"])),
+        submodules={name: float(ms) for name, ms in config.get("submodules", {}).items()},
+    )
+
+
+def measure_import(module: str, runs: int) -> dict[str, tuple[int, int]]:
+    """Import ``module`` in fresh interpreters and time every module it pulls in.
+    
+    Only the import tree of ``module`` is kept, not interpreter startup.
+    Each module keeps its fastest run, which filters out scheduling noise.
+    
+    Returns:
+        Mapping of module name to (self, cumulative) microseconds
+    """
+    best: dict[str, tuple[int, int]] = {}
+    for _ in range(runs):
+        result = run_command(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            check=False,
+        )
+        if not result.success:
+            console.print(f"[red]❌ import {module} failed[/red]")
+            console.print(result.stderr.rstrip(), markup=False)
+            raise typer.Exit(1)
+        
+        # Children are reported before their parent, one indent level deeper;
+        # everything since the previous top-level line belongs to this import
+        subtree = []
+        for line in result.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            name = match.group(4)
+            subtree.append((name, int(match.group(1)), int(match.group(2))))
+            if match.group(3):
+                continue
+            if name == module:
+                for entry, self_us, cumulative_us in subtree:
+                    previous = best.get(entry, (self_us, cumulative_us))
+                    best[entry] = (min(previous[0], self_us), min(previous[1], cumulative_us))
+            subtree = []
+    return best
+
+
+@app.command()
+def importtime(
+    runs: int = typer.Option(5, "--runs", "-n", help="Fresh interpreters to measure; each module keeps its fastest time"),
+    top: int = typer.Option(15, "--top", help="Number of most expensive modules to show"),
+) -> None:
+    """Check package import time against the budget in pyproject.toml."""
+    panel = Panel.fit("⏱️ Measuring Import Time", style="blue")
+    console.print(panel)
+    
+    package = "{{ cookiecutter.package_name }}"
+    budget = load_importtime_budget()
+    with Status(f"Importing {package} ({runs} runs)...", console=console, spinner="dots"):
+        timings = measure_import(package, runs)
+    
+    def limit_for(name: str) -> float | None:
+        if name == package:
+            return budget["total_ms"]
+        if name.startswith(f"{package}."):
+            return budget["submodules"].get(name, budget["submodule_ms"])
+        return None
+    
+    over_budget = [
+        name for name, (_, cumulative_us) in timings.items()
+        if (limit := limit_for(name)) is not None and cumulative_us / 1000 > limit
+    ]
+    
+    table = Table(title=f"Import Time of {package}", show_header=True, header_style="bold magenta")
+    table.add_column("Module", style="cyan")
+    table.add_column("Self", justify="right")
+    table.add_column("Cumulative", justify="right")
+    table.add_column("Budget", justify="right")
+    ranked = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)
+    shown = ranked[:top] + [item for item in ranked[top:] if item[0] in over_budget]
+    for name, (self_us, cumulative_us) in shown:
+        limit = limit_for(name)
+        style = "red" if name in over_budget else "white"
+        table.add_row(
+            name,
+            f"{self_us / 1000:.2f}ms",
+            f"[{style}]{cumulative_us / 1000:.2f}ms[/{style}]",
+            f"{limit:.0f}ms" if limit is not None else "-",
+        )
+    console.print(table)
+    
+    if over_budget:
+        console.print(f"[red]❌ Over the import-time budget: {', '.join(sorted(over_budget))}[/red]")
+        console.print("[yellow]💡 Budgets live in \\[tool.importtime] in pyproject.toml[/yellow]")
+        raise typer.Exit(1)
+    console.print("[green]✅ Import time within budget![/green]")
+
+
 @app.command()
 def coverage(
     html: bool = typer.Option(False, "--html", help="Generate HTML coverage report"),
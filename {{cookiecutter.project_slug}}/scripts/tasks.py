@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Task graph runner for composite tasks.
+Runs independent tasks side by side, skips tasks whose inputs are unchanged
+since their last successful run, and reports how long each task took.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from cache import digest_inputs
+from rich.console import Console
+from rich.table import Table
+from utils import DEFAULT_TAIL_BYTES, PROJECT_ROOT, CommandResult, run_command
+
+console = Console()
+
+CLI_PATH = PROJECT_ROOT / "scripts" / "cli.py"
+
+# Fingerprints of each task's last successful run
+STATE_PATH = PROJECT_ROOT / ".cache" / "tasks.json"
+
+# In-process tasks write straight to the terminal, so they take turns
+_TERMINAL = threading.Lock()
+
+
+class Task:
+    """A node in the task graph: one cli.py subcommand invocation.
+
+    Tasks with ``inputs`` are skipped when those files are unchanged since
+    the last successful run and every declared output still exists. Tasks
+    that run ``in_process`` save an interpreter start but take turns on the
+    terminal; the rest run as their own process with captured output, so
+    they can overlap any other task.
+    """
+
+    def __init__(self, name: str, args: list[str], deps: tuple[str, ...] = (),
+                 inputs: tuple[str, ...] = (), outputs: tuple[str, ...] = (),
+                 in_process: bool = False):
+        self.name = name
+        self.args = args
+        self.deps = deps
+        self.inputs = inputs
+        self.outputs = outputs
+        self.in_process = in_process
+
+    def fingerprint(self) -> str:
+        """Hash the task's arguments and the contents of its inputs."""
+        inputs_digest = digest_inputs([Path(path) for path in self.inputs])
+        payload = json.dumps({"args": self.args, "inputs": inputs_digest})
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def outputs_exist(self) -> bool:
+        """Whether every declared output is present."""
+        return all((PROJECT_ROOT / path).exists() for path in self.outputs)
+
+
+class TaskOutcome:
+    """How a task ended: passed, failed, skipped (up to date) or blocked."""
+
+    def __init__(self, status: str, duration: float = 0.0,
+                 result: CommandResult | None = None):
+        self.status = status
+        self.duration = duration
+        self.result = result
+
+    @property
+    def success(self) -> bool:
+        """Whether dependents may run after this task."""
+        return self.status in ("passed", "skipped")
+
+
+# Composite tasks wired into pixi (through cli.py)
+PIPELINES: dict[str, list[Task]] = {
+    # Every step walks the project tree; the ones deleting __pycache__ and
+    # searching the whole tree must not overlap
+    "clean": [
+        Task("test-clean", ["test", "clean"], in_process=True),
+        Task("dev-clean", ["dev", "clean"], deps=("test-clean",), in_process=True),
+        Task("docs-clean", ["docs", "clean"], deps=("dev-clean",), in_process=True),
+        Task("build-clean", ["build", "clean"], in_process=True),
+    ],
+    # Both steps spend their time in pytest and the linters, which run as
+    # child processes anyway; a wrapper interpreter per step would only add
+    # start-up time
+    "check-all": [
+        Task(
+            "tests",
+            ["test", "all"],
+            inputs=("{{ cookiecutter.package_name }}", "tests", "docs", "pixi.toml"),
+            outputs=("htmlcov",),
+            in_process=True,
+        ),
+        Task(
+            "quality",
+            ["quality", "check"],
+            inputs=("{{ cookiecutter.package_name }}", "tests"),
+            in_process=True,
+        ),
+    ],
+}
+
+
+def validate(tasks: list[Task]) -> None:
+    """Reject unknown dependencies and cycles.
+
+    Raises:
+        ValueError: If the graph is not a DAG over the given tasks
+    """
+    names = {task.name for task in tasks}
+    for task in tasks:
+        missing = set(task.deps) - names
+        if missing:
+            raise ValueError(f"Task {task.name!r} depends on unknown tasks: {sorted(missing)}")
+
+    remaining = {task.name: set(task.deps) for task in tasks}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Task graph has a cycle among: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def _load_state() -> dict[str, str]:
+    try:
+        return json.loads(STATE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: dict[str, str]) -> None:
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2))
+    os.replace(tmp_path, STATE_PATH)
+
+
+def _execute(task: Task) -> TaskOutcome:
+    """Run one task and time it.
+
+    A task that raises fails like one that exits non-zero, with the
+    traceback as its output, so the rest of the graph carries on.
+    """
+    started = time.perf_counter()
+    try:
+        if task.in_process:
+            # Imported here because cli.py builds on this module
+            from cli import run_in_process
+
+            with _TERMINAL:
+                started = time.perf_counter()
+                try:
+                    exit_code = run_in_process(task.args[0], task.args[1:])
+                except SystemExit as e:
+                    exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            status = "passed" if exit_code == 0 else "failed"
+            return TaskOutcome(status, time.perf_counter() - started)
+
+        result = run_command(
+            [sys.executable, str(CLI_PATH), *task.args],
+            check=False,
+            tail_bytes=DEFAULT_TAIL_BYTES,
+        )
+    except Exception:
+        crashed = CommandResult(returncode=1, stderr=traceback.format_exc(), command=task.args)
+        return TaskOutcome("failed", time.perf_counter() - started, crashed)
+
+    status = "passed" if result.success else "failed"
+    return TaskOutcome(status, time.perf_counter() - started, result)
+
+
+def _report_output(task: Task, outcome: TaskOutcome) -> None:
+    """Print a finished task's captured output as one block."""
+    result = outcome.result
+    if result is None:
+        return
+    style = "green" if outcome.success else "red"
+    console.rule(f"[{style}]{task.name}[/{style}]")
+    if result.truncated:
+        dropped = result.stdout_dropped + result.stderr_dropped
+        console.print(f"[yellow]… {dropped} bytes of earlier output dropped[/yellow]")
+    if result.stdout:
+        console.print(result.stdout.rstrip(), markup=False, highlight=False)
+    if result.stderr:
+        console.print(result.stderr.rstrip(), markup=False, highlight=False)
+
+
+def run_graph(tasks: list[Task], force: bool = False,
+              max_workers: int | None = None) -> dict[str, TaskOutcome]:
+    """Run a task graph, each task as soon as its dependencies succeeded.
+
+    A failing task only blocks its dependents; independent tasks still run,
+    and their up-to-date state is kept for the next run.
+
+    Args:
+        tasks: Graph nodes; dependencies refer to other task names
+        force: Run every task even if its inputs are unchanged
+        max_workers: Upper bound on concurrent tasks (defaults to CPU count)
+
+    Returns:
+        Mapping of task name to TaskOutcome, in the order given
+
+    Raises:
+        ValueError: If the graph has unknown dependencies or a cycle
+    """
+    validate(tasks)
+    by_name = {task.name: task for task in tasks}
+    state = _load_state()
+    fingerprints: dict[str, str] = {}
+    outcomes: dict[str, TaskOutcome] = {}
+    pending = dict(by_name)
+    running: dict[Future[TaskOutcome], str] = {}
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                for name, task in list(pending.items()):
+                    dep_outcomes = [outcomes.get(dep) for dep in task.deps]
+                    if any(outcome is not None and not outcome.success for outcome in dep_outcomes):
+                        outcomes[name] = TaskOutcome("blocked")
+                        del pending[name]
+                        continue
+                    if any(outcome is None for outcome in dep_outcomes):
+                        continue
+
+                    del pending[name]
+                    if task.inputs:
+                        fingerprints[name] = task.fingerprint()
+                        if not force and state.get(name) == fingerprints[name] and task.outputs_exist():
+                            outcomes[name] = TaskOutcome("skipped")
+                            continue
+                    running[pool.submit(_execute, task)] = name
+
+                if not running:
+                    # Only skipped or blocked tasks were released; look again
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outcome = future.result()
+                    outcomes[name] = outcome
+                    _report_output(by_name[name], outcome)
+                    if name in fingerprints:
+                        if outcome.success:
+                            state[name] = fingerprints[name]
+                        else:
+                            state.pop(name, None)
+    finally:
+        # Keep what finished even if the run is interrupted
+        _save_state(state)
+    return {task.name: outcomes[task.name] for task in tasks}
+
+
+def print_summary(title: str, outcomes: dict[str, TaskOutcome], wall_time: float) -> None:
+    """Print each task's result and duration."""
+    labels = {
+        "passed": "✅ Pass",
+        "failed": "❌ Fail",
+        "skipped": "⏭️ Up to date",
+        "blocked": "⛔ Blocked",
+    }
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Task", style="cyan")
+    table.add_column("Result", justify="center")
+    table.add_column("Time", justify="right")
+
+    for name, outcome in outcomes.items():
+        duration = f"{outcome.duration:.2f}s" if outcome.status in ("passed", "failed") else "-"
+        table.add_row(name, labels[outcome.status], duration)
+
+    busy = sum(outcome.duration for outcome in outcomes.values())
+    table.caption = f"{wall_time:.2f}s wall, {busy:.2f}s of task time"
+    console.print(table)
+
+
+def run_pipeline(name: str, force: bool = False, max_workers: int | None = None) -> bool:
+    """Run a named pipeline, print its summary and report overall success."""
+    started = time.perf_counter()
+    outcomes = run_graph(PIPELINES[name], force=force, max_workers=max_workers)
+    print_summary(name, outcomes, time.perf_counter() - started)
+    return all(outcome.success for outcome in outcomes.values())
@@ -4,112 +4,403 @@ Shared utilities for script commands.
 Provides a unified command runner using the sh library.
 """
 
+import asyncio
+import atexit
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import sh
 import typer
 from rich.console import Console
+from rich.table import Table
+
+if sys.platform != "win32":
+    import resource
 
 console = Console()
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Process-wide registry of resolved, baked sh commands keyed by name.
+# Entries are only valid for the PATH they were resolved against.
+_COMMAND_CACHE: dict[str, Any] = {}
+_COMMAND_CACHE_PATH: str | None = None
+_COMMAND_CACHE_LOCK = threading.Lock()
+
+# How much of each stream bounded capture keeps for failure summaries
+DEFAULT_TAIL_BYTES = 64 * 1024
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_RSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+# Every command run in this process, collected once --profile is enabled
+_PROFILE: list["CommandResult"] | None = None
+
 
 class CommandResult:
     """Result wrapper for command execution."""
     
-    def __init__(self, returncode: int = 0, stdout: str = "", stderr: str = ""):
+    def __init__(self, returncode: int = 0, stdout: str = "", stderr: str = "",
+                 stdout_dropped: int = 0, stderr_dropped: int = 0,
+                 command: list[str] | None = None, wall_time: float = 0.0,
+                 user_time: float = 0.0, system_time: float = 0.0,
+                 max_rss: int | None = None, signal: int | None = None,
+                 cached: bool = False, usage_approximate: bool = False):
         self.returncode = returncode
         self.stdout = stdout
         self.stderr = stderr
+        self.stdout_dropped = stdout_dropped
+        self.stderr_dropped = stderr_dropped
+        self.command = command or []
+        self.wall_time = wall_time
+        self.user_time = user_time
+        self.system_time = system_time
+        self.max_rss = max_rss
+        self.signal = signal
+        self.cached = cached
+        self.usage_approximate = usage_approximate
         
     @property
     def success(self) -> bool:
         """Whether the command was successful."""
         return self.returncode == 0
+    
+    @property
+    def truncated(self) -> bool:
+        """Whether bounded capture discarded any output."""
+        return self.stdout_dropped > 0 or self.stderr_dropped > 0
+    
+    @property
+    def cpu_time(self) -> float:
+        """User plus system CPU seconds spent by the child."""
+        return self.user_time + self.system_time
+
+
+class OutputTail:
+    """Ring buffer that keeps only the last ``max_bytes`` of a text stream.
+    
+    A ``max_bytes`` of None keeps everything.
+    """
+    
+    def __init__(self, max_bytes: int | None = DEFAULT_TAIL_BYTES):
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lines: deque[tuple[str, int]] = deque()
+        self._size = 0
+    
+    def append(self, text: str) -> None:
+        """Add a chunk of output, evicting the oldest lines past the limit."""
+        size = len(text.encode(errors="replace"))
+        self._lines.append((text, size))
+        self._size += size
+        if self.max_bytes is None:
+            return
+        while self._size > self.max_bytes and self._lines:
+            _, evicted = self._lines.popleft()
+            self._size -= evicted
+            self.dropped += evicted
+    
+    def getvalue(self) -> str:
+        """Return the retained output."""
+        return "".join(text for text, _ in self._lines)
+
+
+@dataclass(frozen=True)
+class UsageSnapshot:
+    """Resource usage totals of every child reaped so far."""
+    
+    user_time: float
+    system_time: float
+    # High-water mark of the largest child, in bytes
+    max_rss: int
+
+
+def usage_snapshot() -> UsageSnapshot | None:
+    """Resource usage of all reaped children so far (None on Windows)."""
+    if sys.platform == "win32":
+        return None
+    else:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return UsageSnapshot(usage.ru_utime, usage.ru_stime, usage.ru_maxrss * _RSS_SCALE)
+
+
+def record_usage(result: CommandResult, cmd: list[str], started: float,
+                 before: UsageSnapshot | None, approximate: bool = False) -> CommandResult:
+    """Attach timing and resource usage to a result and record it.
+    
+    Neither sh nor asyncio expose per-child rusage, so CPU time is the
+    growth of the process-wide children totals since ``before``, a
+    ``usage_snapshot()`` taken when the command started. That is exact for
+    sequential commands; callers that overlapped the command with others
+    pass ``approximate=True``. Peak RSS is only known when this command
+    raised the children high-water mark.
+    """
+    result.command = cmd
+    result.wall_time = time.perf_counter() - started
+    result.usage_approximate = approximate
+    after = usage_snapshot()
+    if before is not None and after is not None:
+        result.user_time = after.user_time - before.user_time
+        result.system_time = after.system_time - before.system_time
+        if after.max_rss > before.max_rss:
+            result.max_rss = after.max_rss
+    if result.returncode < 0:
+        result.signal = -result.returncode
+    
+    if _PROFILE is not None:
+        _PROFILE.append(result)
+    return result
+
+
+def resolve_command(command_name: str) -> Any:
+    """Look up a command on PATH and bake it, once per process.
+    
+    Resolved commands are cached by name and the whole registry is dropped
+    whenever ``PATH`` changes, so repeated calls skip the PATH search.
+    
+    Args:
+        command_name: Executable name, e.g. "git" or "pre-commit"
+        
+    Returns:
+        sh command baked to run in the project root
+        
+    Raises:
+        AttributeError: If the command cannot be found on PATH
+    """
+    global _COMMAND_CACHE_PATH
+    
+    path = os.environ.get("PATH", "")
+    with _COMMAND_CACHE_LOCK:
+        if path != _COMMAND_CACHE_PATH:
+            _COMMAND_CACHE.clear()
+            _COMMAND_CACHE_PATH = path
+        
+        command = _COMMAND_CACHE.get(command_name)
+        if command is None:
+            # Handle special cases for command names with hyphens
+            command_attr = command_name.replace('-', '_')
+            
+            # Get the command from sh
+            try:
+                command = getattr(sh, command_attr)
+            except AttributeError:
+                # Try without underscore replacement for some commands
+                command = getattr(sh, command_name)
+            
+            # Set working directory
+            command = command.bake(_cwd=PROJECT_ROOT)
+            _COMMAND_CACHE[command_name] = command
+        
+        return command
+
+
+def clear_command_cache() -> None:
+    """Forget all resolved commands (e.g. after installing new tools)."""
+    global _COMMAND_CACHE_PATH
+    
+    with _COMMAND_CACHE_LOCK:
+        _COMMAND_CACHE.clear()
+        _COMMAND_CACHE_PATH = None
+
+
+class CommandStream:
+    """Iterate over a command's stdout lines as they arrive.
+    
+    Only the last ``tail_bytes`` of stdout and stderr are kept; once
+    iteration finishes, ``result`` holds a CommandResult with those tails
+    and the number of bytes dropped from each stream.
+    """
+    
+    def __init__(self, cmd: list[str], tail_bytes: int = DEFAULT_TAIL_BYTES):
+        self.cmd = cmd
+        self.tail_bytes = tail_bytes
+        self.result: CommandResult | None = None
+    
+    def __iter__(self) -> Iterator[str]:
+        stdout_tail = OutputTail(self.tail_bytes)
+        stderr_tail = OutputTail(self.tail_bytes)
+        started = time.perf_counter()
+        before = usage_snapshot()
+        
+        try:
+            command = resolve_command(self.cmd[0])
+        except AttributeError:
+            self.result = CommandResult(returncode=1, stderr=f"Command not found: {self.cmd[0]}")
+            return
+        
+        # sh keeps its own copy of stdout; shrink it to a single chunk since
+        # the tail buffer is what we report from. Captured output is plain
+        # text, so don't give the child a pseudo-terminal (no colours or
+        # spinners written into it). A failing status is raised here, when
+        # iteration ends, rather than printed from sh's background thread
+        process = command(
+            *self.cmd[1:],
+            _iter=True,
+            _tty_out=False,
+            _err=stderr_tail.append,
+            _internal_bufsize=1,
+            _bg_exc=False,
+        )
+        
+        returncode = 0
+        finished = False
+        try:
+            try:
+                for line in process:
+                    stdout_tail.append(line)
+                    yield line
+            except sh.ErrorReturnCode as e:
+                returncode = e.exit_code
+            finished = True
+        finally:
+            # Stop the child if the consumer bailed out early
+            if not finished and process.is_alive():
+                process.kill()
+            try:
+                process.wait()
+            except sh.ErrorReturnCode as e:
+                returncode = e.exit_code
+            self.result = record_usage(
+                CommandResult(
+                    returncode=returncode,
+                    stdout=stdout_tail.getvalue(),
+                    stderr=stderr_tail.getvalue(),
+                    stdout_dropped=stdout_tail.dropped,
+                    stderr_dropped=stderr_tail.dropped,
+                ),
+                self.cmd,
+                started,
+                before,
+            )
 
 
-def run_command(cmd: list[str], capture_output: bool = False, check: bool = True) -> CommandResult:
+def stream_command(cmd: list[str], tail_bytes: int = DEFAULT_TAIL_BYTES) -> CommandStream:
+    """Run a command in streaming mode with bounded output capture.
+    
+    Args:
+        cmd: Command and arguments as list
+        tail_bytes: Bytes of each stream to keep for the final result
+        
+    Returns:
+        CommandStream yielding stdout lines; its ``result`` is set at the end
+    """
+    return CommandStream(cmd, tail_bytes=tail_bytes)
+
+
+def run_command(cmd: list[str], capture_output: bool = False, check: bool = True,
+                tail_bytes: int | None = None) -> CommandResult:
     """Run a shell command with proper error handling using sh.
     
     Args:
         cmd: Command and arguments as list
         capture_output: Whether to capture stdout/stderr
         check: Whether to raise on non-zero exit code
+        tail_bytes: Capture in bounded mode, keeping only the last N bytes
+            of each stream (implies capture_output)
         
     Returns:
-        CommandResult with returncode, stdout, stderr
+        CommandResult with returncode, stdout, stderr and resource usage
         
     Raises:
         typer.Exit: If check=True and command fails
     """
+    if tail_bytes is not None:
+        return _run_command_bounded(cmd, check=check, tail_bytes=tail_bytes)
+    
+    started = time.perf_counter()
+    before = usage_snapshot()
+    
     try:
         command_name = cmd[0]
         args = cmd[1:] if len(cmd) > 1 else []
         
-        # Handle special cases for command names with hyphens
-        command_attr = command_name.replace('-', '_')
-        
-        # Get the command from sh
+        # Resolve (or reuse) the baked command from the registry
         try:
-            command = getattr(sh, command_attr)
+            command = resolve_command(command_name)
         except AttributeError:
-            # Try without underscore replacement for some commands
-            try:
-                command = getattr(sh, command_name)
-            except AttributeError:
-                console.print(f"[red]❌ Command not found: {command_name}[/red]")
-                if check:
-                    raise typer.Exit(1)
-                return CommandResult(returncode=1, stderr=f"Command not found: {command_name}")
-        
-        # Set working directory
-        command = command.bake(_cwd=PROJECT_ROOT)
+            console.print(f"[red]❌ Command not found: {command_name}[/red]")
+            if check:
+                raise typer.Exit(1)
+            return CommandResult(returncode=1, stderr=f"Command not found: {command_name}")
         
         if capture_output:
             try:
                 result = command(*args, _return_cmd=True)
-                return CommandResult(
+                return record_usage(CommandResult(
                     returncode=0,
-                    stdout=str(result.stdout),
-                    stderr=str(result.stderr)
-                )
+                    stdout=result.stdout.decode() if result.stdout else "",
+                    stderr=result.stderr.decode() if result.stderr else ""
+                ), cmd, started, before)
             except sh.ErrorReturnCode as e:
-                return CommandResult(
+                return record_usage(CommandResult(
                     returncode=e.exit_code,
                     stdout=e.stdout.decode() if e.stdout else "",
                     stderr=e.stderr.decode() if e.stderr else ""
-                )
+                ), cmd, started, before)
         else:
             # Run command without capturing output
             command(*args)
-            return CommandResult()
+            return record_usage(CommandResult(), cmd, started, before)
             
     except sh.ErrorReturnCode as e:
+        failed = record_usage(CommandResult(
+            returncode=e.exit_code,
+            stdout=e.stdout.decode() if e.stdout else "",
+            stderr=e.stderr.decode() if e.stderr else ""
+        ), cmd, started, before)
         console.print(f"[red]❌ Command failed: {' '.join(cmd)}[/red]")
         if capture_output:
-            stdout = e.stdout.decode() if e.stdout else ""
-            stderr = e.stderr.decode() if e.stderr else ""
-            if stdout:
-                console.print(f"[yellow]STDOUT: {stdout}[/yellow]")
-            if stderr:
-                console.print(f"[red]STDERR: {stderr}[/red]")
+            if failed.stdout:
+                console.print(f"[yellow]STDOUT: {failed.stdout}[/yellow]")
+            if failed.stderr:
+                console.print(f"[red]STDERR: {failed.stderr}[/red]")
         
         if check:
             raise typer.Exit(1)
         
-        return CommandResult(
-            returncode=e.exit_code,
-            stdout=e.stdout.decode() if e.stdout else "",
-            stderr=e.stderr.decode() if e.stderr else ""
-        )
+        return failed
     except Exception as e:
         console.print(f"[red]❌ Unexpected error running command: {e}[/red]")
         if check:
             raise typer.Exit(1)
-        return CommandResult(returncode=1, stderr=str(e))
+        return CommandResult(returncode=1, stderr=str(e), command=cmd)
+
+
+def _run_command_bounded(cmd: list[str], check: bool, tail_bytes: int) -> CommandResult:
+    """Drain a streaming command, keeping only the tail of its output."""
+    stream = stream_command(cmd, tail_bytes=tail_bytes)
+    for _ in stream:
+        pass
+    assert stream.result is not None
+    result = stream.result
+    
+    if check and not result.success:
+        print_failure(cmd, result)
+        raise typer.Exit(1)
+    
+    return result
+
+
+def print_failure(cmd: list[str], result: CommandResult) -> None:
+    """Report a failed command along with whatever output was captured."""
+    console.print(f"[red]❌ Command failed: {' '.join(cmd)}[/red]")
+    if result.stdout:
+        if result.stdout_dropped:
+            console.print(f"[yellow]… {result.stdout_dropped} bytes of stdout dropped[/yellow]")
+        console.print(f"[yellow]STDOUT: {result.stdout}[/yellow]")
+    if result.stderr:
+        if result.stderr_dropped:
+            console.print(f"[red]… {result.stderr_dropped} bytes of stderr dropped[/red]")
+        console.print(f"[red]STDERR: {result.stderr}[/red]")
 
 
 def run_command_simple(cmd: list[str]) -> bool:
@@ -134,4 +425,119 @@ def run_command_capture(cmd: list[str]) -> CommandResult:
     Returns:
         CommandResult with captured output
     """
-    return run_command(cmd, capture_output=True, check=False)
\ No newline at end of file
+    return run_command(cmd, capture_output=True, check=False)
+
+
+def run_parallel(commands: dict[str, list[str]], max_workers: int | None = None,
+                 tail_bytes: int = DEFAULT_TAIL_BYTES) -> dict[str, CommandResult]:
+    """Run independent commands concurrently, at most ``max_workers`` at a time.
+    
+    A synchronous wrapper around ``async_utils.gather_commands``: every
+    command runs to completion with its output captured, so results can be
+    reported per command once everything has finished.
+    
+    Args:
+        commands: Mapping of check name to command and arguments
+        max_workers: Upper bound on concurrent commands (defaults to CPU count)
+        tail_bytes: Bytes of each command's output to keep
+        
+    Returns:
+        Mapping of check name to CommandResult, in the order given
+    """
+    # Imported here because async_utils builds on this module
+    from async_utils import gather_commands
+    
+    return asyncio.run(gather_commands(
+        commands, limit=max_workers, fail_fast=False, tail_bytes=tail_bytes
+    ))
+
+
+def run_batch(cmds: list[list[str]], capture_output: bool = False, check: bool = True) -> list[CommandResult]:
+    """Run many short commands back to back, resolving each executable once.
+    
+    All distinct executables are resolved up front through the registry,
+    then the commands run in order.
+    
+    Args:
+        cmds: Commands and arguments as lists
+        capture_output: Whether to capture stdout/stderr
+        check: Whether to raise on the first non-zero exit code
+        
+    Returns:
+        One CommandResult per command, in the order given
+        
+    Raises:
+        typer.Exit: If check=True and a command fails
+    """
+    for command_name in dict.fromkeys(cmd[0] for cmd in cmds):
+        # A missing command is reported by run_command when it is actually run
+        with contextlib.suppress(AttributeError):
+            resolve_command(command_name)
+    
+    return [run_command(cmd, capture_output=capture_output, check=check) for cmd in cmds]
+
+
+def enable_profiling() -> None:
+    """Start recording command costs and print them when the process exits."""
+    global _PROFILE
+    
+    if _PROFILE is None:
+        _PROFILE = []
+        atexit.register(print_profile)
+
+
+def print_profile() -> None:
+    """Print recorded command costs, most expensive (wall time) first."""
+    if not _PROFILE:
+        return
+    
+    table = Table(title="Command Costs", show_header=True, header_style="bold magenta")
+    table.add_column("Command", style="cyan", overflow="fold")
+    table.add_column("Wall", justify="right")
+    table.add_column("User", justify="right")
+    table.add_column("Sys", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    table.add_column("Exit", justify="center")
+    
+    for result in sorted(_PROFILE, key=lambda r: r.wall_time, reverse=True):
+        if result.signal is not None:
+            exit_status = f"signal {result.signal}"
+        else:
+            exit_status = str(result.returncode)
+        # Overlapping commands may be charged each other's usage
+        mark = "~" if result.usage_approximate else ""
+        table.add_row(
+            " ".join(result.command),
+            f"{result.wall_time:.2f}s",
+            f"{mark}{result.user_time:.2f}s",
+            f"{mark}{result.system_time:.2f}s",
+            mark + format_bytes(result.max_rss) if result.max_rss is not None else "-",
+            exit_status,
+        )
+    
+    total_wall = sum(r.wall_time for r in _PROFILE)
+    total_cpu = sum(r.cpu_time for r in _PROFILE)
+    table.caption = f"{len(_PROFILE)} commands, {total_wall:.2f}s wall, {total_cpu:.2f}s CPU"
+    if any(r.usage_approximate for r in _PROFILE):
+        table.caption += "\n~ ran alongside other commands; usage is approximate"
+    console.print(table)
+
+
+def format_bytes(size: int | None) -> str:
+    """Render a byte count, e.g. for the cost table."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def profile_option(
+    profile: bool = typer.Option(False, "--profile", help="Print a per-command cost table at exit"),
+) -> None:
+    """Shared app callback adding --profile to every script."""
+    if profile:
+        enable_profiling()
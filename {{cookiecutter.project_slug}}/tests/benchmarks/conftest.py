@@ -0,0 +1,101 @@
+"""
+Benchmark fixtures for {{ cookiecutter.project_name }}.
+Benchmarks are skipped unless pytest runs with --run-benchmarks; use
+``python scripts/test.py bench`` to run them and compare against baselines.
+"""
+import gc
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+
+# Iterations per timed round are calibrated until a round takes this long
+ROUND_TIME = 0.01
+
+# Timing budget per benchmark, and bounds on the number of rounds within it
+MAX_TIME = 1.0
+MIN_ROUNDS = 5
+MAX_ROUNDS = 1000
+
+# Statistics per benchmark node id, written out by --benchmark-json
+_results: dict[str, dict[str, float]] = {}
+
+
+class Benchmark:
+    """Time a callable over calibrated rounds and record per-call statistics.
+
+    One round calls the function enough times to take ``ROUND_TIME``, so
+    timer resolution does not swamp microbenchmarks, while slow functions
+    run once per round. The garbage collector is paused while timing.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats: dict[str, float] | None = None
+
+    def __call__(self, func, *args, **kwargs):
+        """Benchmark ``func(*args, **kwargs)`` and return its result."""
+        result = func(*args, **kwargs)
+        iterations = self._calibrate(func, args, kwargs)
+
+        timings = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            deadline = time.perf_counter() + MAX_TIME
+            while len(timings) < MIN_ROUNDS or (
+                len(timings) < MAX_ROUNDS and time.perf_counter() < deadline
+            ):
+                timings.append(self._time(func, args, kwargs, iterations) / iterations)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        timings.sort()
+        self.stats = {
+            "min": timings[0],
+            "median": statistics.median(timings),
+            "p99": timings[math.ceil(0.99 * len(timings)) - 1],
+            "rounds": len(timings),
+            "iterations": iterations,
+        }
+        _results[self.name] = self.stats
+        return result
+
+    def _calibrate(self, func, args, kwargs) -> int:
+        """Find how many calls make up one round of at least ``ROUND_TIME``."""
+        iterations = 1
+        while True:
+            elapsed = self._time(func, args, kwargs, iterations)
+            if elapsed >= ROUND_TIME:
+                return iterations
+            # Grow towards the target: at least double, at most 10x per step
+            iterations *= min(10, max(2, math.ceil(ROUND_TIME / max(elapsed, 1e-9))))
+
+    @staticmethod
+    def _time(func, args, kwargs, iterations: int) -> float:
+        calls = range(iterations)
+        started = time.perf_counter()
+        for _ in calls:
+            func(*args, **kwargs)
+        return time.perf_counter() - started
+
+
+@pytest.fixture
+def benchmark(request) -> Benchmark:
+    """Benchmark runner named after the requesting test."""
+    return Benchmark(request.node.nodeid)
+
+
+def pytest_sessionfinish(session):
+    """Write collected benchmark statistics for scripts/test.py bench."""
+    output = session.config.getoption("--benchmark-json")
+    if not output or not _results:
+        return
+
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(_results, indent=2, sort_keys=True))
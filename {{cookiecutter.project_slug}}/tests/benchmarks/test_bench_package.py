@@ -0,0 +1,25 @@
+"""
+Benchmarks for {{ cookiecutter.project_name }}.
+Run with ``python scripts/test.py bench``; each test passes the code to time
+to the ``benchmark`` fixture.
+"""
+
+import importlib
+
+import pytest
+
+import {{ cookiecutter.package_name }}
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_package_import(benchmark):
+    """Macro benchmark: re-executing the package module."""
+    module = benchmark(importlib.reload, {{ cookiecutter.package_name }})
+    assert module.__version__ == "{{ cookiecutter.version }}"
+
+
+def test_version_lookup(benchmark):
+    """Micro benchmark: a cheap call, timed over many iterations per round."""
+    version = benchmark({{ cookiecutter.package_name }}._get_version)
+    assert version == {{ cookiecutter.package_name }}.__version__
@@ -10,6 +10,9 @@ import asyncio
 {%- endif %}
 
 import {{ cookiecutter.package_name }}
+{%- if cookiecutter.database_backend == "postgresql" %}
+from {{ cookiecutter.package_name }}.streaming import {% if cookiecutter.use_async == "yes" %}async_stream_batches, {% endif %}stream_batches, stream_rows
+{%- endif %}
 
 
 @pytest.mark.integration
@@ -17,10 +20,9 @@ class TestDatabaseIntegration:
     """Test database integration functionality."""
 
 {%- if cookiecutter.database_backend == "mongodb" %}
-    def test_mongodb_connection(self, mongodb_client, test_database_name):
+    def test_mongodb_connection(self, test_collection):
         """Test MongoDB connection and basic operations."""
-        db = mongodb_client[test_database_name]
-        collection = db.test_collection
+        collection = test_collection
         
         # Test insert
         test_doc = {"name": "test", "value": 42}
@@ -171,7 +173,47 @@ class TestDatabaseIntegration:
         updated_name = cursor.fetchone()[0]
         assert updated_name == "Updated Test Item 1"
 
+    def test_postgresql_streaming(self, postgres_connection):
+        """Test streaming a result set through a server-side cursor."""
+        cursor = postgres_connection.cursor()
+        cursor.execute(
+            "CREATE TEMPORARY TABLE stream_table AS "
+            "SELECT n AS id, n * 2 AS doubled FROM generate_series(1, 25) AS n"
+        )
+
+        # Fetched itersize rows at a time, as tuples
+        batches = list(stream_batches(
+            "SELECT id, doubled FROM stream_table ORDER BY id", itersize=10, conn=postgres_connection
+        ))
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert batches[0][0] == (1, 2)
+
+        # Slotted records named after the columns
+        records = list(stream_rows(
+            "SELECT id, doubled FROM stream_table WHERE id > %s ORDER BY id",
+            (20,),
+            as_records=True,
+            conn=postgres_connection,
+        ))
+        assert [record.doubled for record in records] == [42, 44, 46, 48, 50]
+        assert not hasattr(records[0], "__dict__")
 {%- if cookiecutter.use_async == "yes" %}
+
+    @pytest.mark.asyncio
+    async def test_async_postgresql_streaming(self, async_postgres_connection):
+        """Test streaming a result set through an asyncpg cursor."""
+        batches = [
+            batch
+            async for batch in async_stream_batches(
+                "SELECT n, n * 2 FROM generate_series(1, $1::int) AS n",
+                25,
+                itersize=10,
+                conn=async_postgres_connection,
+            )
+        ]
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert batches[-1][-1] == (25, 50)
+
     @pytest.mark.asyncio
     async def test_async_postgresql_connection(self, async_postgres_connection):
         """Test async PostgreSQL connection and operations."""
@@ -30,6 +30,9 @@ Example:
 {%- endif %}
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "{{ cookiecutter.version }}"
 __author__ = "{{ cookiecutter.author_name }}"
 __email__ = "{{ cookiecutter.author_email }}"
@@ -69,11 +72,85 @@ __all__.extend([
 ])
 
 
-# Import main functionality
-# TODO: Import your main classes and functions here
-# Example:
-# from .core import MainClass, main_function
-# __all__.extend(["MainClass", "main_function"])
+# Public names imported from their submodule on first access, so importing
+# the package stays cheap and optional dependencies (database drivers and the
+# like) load only when the feature using them is touched.
+_LAZY_EXPORTS: dict[str, str] = {
+    # TODO: Register your main classes and functions here
+    # Example:
+    # "MainClass": ".core",
+    # "main_function": ".core",
+{%- if cookiecutter.database_backend == "mongodb" %}
+    "PoolStats": ".db",
+    "get_client": ".db",
+    "get_database": ".db",
+{%- elif cookiecutter.database_backend == "postgresql" %}
+    "PoolStats": ".db",
+    "connection": ".db",
+    "get_pool": ".db",
+    "stream_batches": ".streaming",
+    "stream_rows": ".streaming",
+{%- if cookiecutter.use_async == "yes" %}
+    "async_connection": ".db",
+    "get_async_pool": ".db",
+    "async_stream_batches": ".streaming",
+    "async_stream_rows": ".streaming",
+{%- endif %}
+{%- endif %}
+}
+
+__all__.extend(_LAZY_EXPORTS)
+
+# Mirror _LAZY_EXPORTS with real imports for type checkers and IDEs:
+{%- if cookiecutter.database_backend == "mongodb" %}
+if TYPE_CHECKING:
+    from .db import PoolStats as PoolStats
+    from .db import get_client as get_client
+    from .db import get_database as get_database
+    # from .core import MainClass, main_function
+{%- elif cookiecutter.database_backend == "postgresql" %}
+if TYPE_CHECKING:
+    from .db import PoolStats as PoolStats
+{%- if cookiecutter.use_async == "yes" %}
+    from .db import async_connection as async_connection
+{%- endif %}
+    from .db import connection as connection
+{%- if cookiecutter.use_async == "yes" %}
+    from .db import get_async_pool as get_async_pool
+{%- endif %}
+    from .db import get_pool as get_pool
+{%- if cookiecutter.use_async == "yes" %}
+    from .streaming import async_stream_batches as async_stream_batches
+    from .streaming import async_stream_rows as async_stream_rows
+{%- endif %}
+    from .streaming import stream_batches as stream_batches
+    from .streaming import stream_rows as stream_rows
+    # from .core import MainClass, main_function
+{%- else %}
+# if TYPE_CHECKING:
+#     from .core import MainClass, main_function
+{%- endif %}
+
+
+if not TYPE_CHECKING:
+    # Hidden from type checkers, which would otherwise accept any attribute
+    def __getattr__(name: str) -> Any:
+        """Resolve a lazily exported name by importing its submodule."""
+        try:
+            module_name = _LAZY_EXPORTS[name]
+        except KeyError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+        value = getattr(importlib.import_module(module_name, __name__), name)
+        # Cache it so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+
+
+def __dir__() -> list[str]:
+    """List lazily exported names alongside the loaded ones."""
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
 
 # Lazy imports for optional dependencies
 def _get_version() -> str:
@@ -0,0 +1,174 @@
+{%- if cookiecutter.database_backend == 'postgresql' -%}
+"""
+Streaming queries for {{ cookiecutter.project_name }}.
+
+Large result sets are read through server-side cursors, ``itersize`` rows
+per round trip, so memory use stays flat however many rows the query
+returns. Rows come back as plain tuples, or as slotted records named
+after the columns with ``as_records=True``; neither builds a dict per row.
+
+Example:
+    ```python
+    from {{ cookiecutter.package_name }}.streaming import stream_rows
+
+    for order in stream_rows(
+        "SELECT id, total FROM orders WHERE status = %s", ("completed",), as_records=True
+    ):
+        print(order.id, order.total)
+    ```
+
+A stream holds its connection, and the transaction around its cursor,
+until it is exhausted or closed; wrap early exits in
+``contextlib.closing`` to return the connection promptly.
+"""
+{% if cookiecutter.use_async == "yes" %}
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
+from contextlib import asynccontextmanager, contextmanager
+{%- else %}
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+{%- endif %}
+from dataclasses import make_dataclass
+from functools import lru_cache
+from typing import Any
+from uuid import uuid4
+
+{%- if cookiecutter.use_async == "yes" %}
+
+import asyncpg
+
+from .db import async_connection, connection
+{%- else %}
+
+from .db import connection
+{%- endif %}
+
+# Rows fetched per round trip to the server
+DEFAULT_ITERSIZE = 2000
+
+Params = Sequence[Any] | Mapping[str, Any] | None
+
+
+@lru_cache(maxsize=128)
+def record_type(fields: tuple[str, ...]) -> type:
+    """Frozen, slotted record class with one attribute per column.
+
+    Column names must be valid identifiers; alias computed columns in SQL.
+    """
+    return make_dataclass("Record", fields, frozen=True, slots=True)
+
+
+def _as_records(rows: list[tuple[Any, ...]], fields: tuple[str, ...]) -> list[Any]:
+    record = record_type(fields)
+    return [record(*row) for row in rows]
+
+
+@contextmanager
+def _borrowed(conn: Any | None) -> Iterator[Any]:
+    if conn is not None:
+        yield conn
+        return
+    with connection() as pooled:
+        yield pooled
+
+
+def stream_batches(
+    query: str,
+    params: Params = None,
+    *,
+    itersize: int = DEFAULT_ITERSIZE,
+    as_records: bool = False,
+    conn: Any | None = None,
+) -> Iterator[list[Any]]:
+    """Yield the rows of ``query`` in lists of up to ``itersize``.
+
+    Runs on ``conn`` if given, which must not be in autocommit mode, and
+    otherwise on a connection borrowed from the pool.
+    """
+    if itersize < 1:
+        raise ValueError(f"itersize must be at least 1, got {itersize}")
+    with (
+        _borrowed(conn) as active,
+        active.cursor(name=f"stream_{uuid4().hex}") as cursor,
+    ):
+        cursor.itersize = itersize
+        cursor.execute(query, params)
+        fields: tuple[str, ...] = ()
+        while rows := cursor.fetchmany(itersize):
+            if not as_records:
+                yield rows
+                continue
+            # A named cursor describes its columns only after the first fetch
+            fields = fields or tuple(column.name for column in cursor.description)
+            yield _as_records(rows, fields)
+
+
+def stream_rows(
+    query: str,
+    params: Params = None,
+    *,
+    itersize: int = DEFAULT_ITERSIZE,
+    as_records: bool = False,
+    conn: Any | None = None,
+) -> Iterator[Any]:
+    """Yield the rows of ``query`` one at a time, fetching ``itersize`` per round trip."""
+    for batch in stream_batches(
+        query, params, itersize=itersize, as_records=as_records, conn=conn
+    ):
+        yield from batch
+{%- if cookiecutter.use_async == "yes" %}
+
+
+@asynccontextmanager
+async def _async_borrowed(
+    conn: asyncpg.Connection | None,
+) -> AsyncIterator[asyncpg.Connection]:
+    if conn is not None:
+        # Cursors only exist inside a transaction
+        async with conn.transaction():
+            yield conn
+        return
+    async with async_connection() as pooled:
+        yield pooled
+
+
+async def async_stream_batches(
+    query: str,
+    *args: Any,
+    itersize: int = DEFAULT_ITERSIZE,
+    as_records: bool = False,
+    conn: asyncpg.Connection | None = None,
+) -> AsyncIterator[list[Any]]:
+    """Yield the rows of ``query`` in lists of up to ``itersize``.
+
+    ``args`` fill the query's ``$1``-style placeholders. Runs on ``conn``
+    if given, and otherwise on a connection borrowed from the async pool.
+    """
+    if itersize < 1:
+        raise ValueError(f"itersize must be at least 1, got {itersize}")
+    async with _async_borrowed(conn) as active:
+        statement = await active.prepare(query)
+        fields = tuple(attribute.name for attribute in statement.get_attributes())
+        cursor = await statement.cursor(*args)
+        while rows := await cursor.fetch(itersize):
+            if as_records:
+                yield _as_records(rows, fields)
+            else:
+                yield [tuple(row) for row in rows]
+
+
+async def async_stream_rows(
+    query: str,
+    *args: Any,
+    itersize: int = DEFAULT_ITERSIZE,
+    as_records: bool = False,
+    conn: asyncpg.Connection | None = None,
+) -> AsyncIterator[Any]:
+    """Yield the rows of ``query`` one at a time, fetching ``itersize`` per round trip."""
+    async for batch in async_stream_batches(
+        query, *args, itersize=itersize, as_records=as_records, conn=conn
+    ):
+        for row in batch:
+            yield row
+{%- endif %}
+{% endif -%}